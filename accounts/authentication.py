@@ -0,0 +1,62 @@
+# JWT 인증 시 유저 조회 결과를 cache에 저장하여, 인증된 요청마다 CustomUser를 DB에서 읽지 않도록 합니다.
+# 유저가 저장/삭제되면 accounts/signals.py에서 cache를 지웁니다.
+# (QuerySet.update()처럼 signal이 발생하지 않는 변경은 invalidate_cached_user를 직접 호출해야 합니다.)
+# cache에는 CACHED_USER_FIELDS만 저장합니다. 비밀번호 hash나 사용 횟수(available_chat_count)처럼
+# 저장하지 않은 필드는 deferred 필드가 되어 접근할 때 DB에서 읽고, save()도 읽어온 필드만 저장합니다.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.settings import api_settings
+
+
+CACHED_USER_FIELDS = (
+    "id",
+    "email",
+    "username",
+    "position",
+    "profile_image",
+    "is_active",
+    "is_staff",
+    "is_superuser",
+)
+
+
+def _cache():
+    return caches[settings.AUTH_USER_CACHE["CACHE_ALIAS"]]
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_cached_user(user_id):
+    _cache().delete(user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    def get_user(self, validated_token):
+        timeout = settings.AUTH_USER_CACHE["TIMEOUT"]
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        # 토큰마다 비밀번호 hash를 비교해야 하는 경우에는 cache를 사용하지 않음
+        if not timeout or user_id is None or api_settings.CHECK_REVOKE_TOKEN:
+            return super().get_user(validated_token)
+
+        key = user_cache_key(user_id)
+        values = _cache().get(key)
+        if values is not None:
+            User = get_user_model()
+            return User.from_db(User.objects.db, CACHED_USER_FIELDS, values)
+
+        # 존재하지 않거나 비활성화된 유저는 여기서 예외가 발생하므로 cache에 저장되지 않음
+        user = super().get_user(validated_token)
+        _cache().set(
+            key, tuple(getattr(user, field) for field in CACHED_USER_FIELDS), timeout
+        )
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    # API 문서에서 기존 JWTAuthentication과 같은 security scheme(jwtAuth)으로 표시
+    target_class = "accounts.authentication.CachedJWTAuthentication"
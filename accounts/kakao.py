@@ -0,0 +1,126 @@
+# 카카오 OAuth / API 호출
+# 모든 요청이 keep-alive connection pool을 가진 하나의 Session을 공유하고,
+# connect / read timeout과 재시도 횟수를 제한합니다.
+# 카카오 장애로 요청이 연속해서 실패하면 circuit breaker가 열려 RESET_TIMEOUT 동안 바로 실패를 반환하므로,
+# 장애 중에도 로그인 요청이 worker를 timeout까지 점유하지 않습니다.
+import logging
+import threading
+import time
+from functools import lru_cache
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+KAKAO_TOKEN_URL = "https://kauth.kakao.com/oauth/token"
+KAKAO_USER_ME_URL = "https://kapi.kakao.com/v2/user/me"
+
+
+class KakaoUnavailable(Exception):
+    pass
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold, reset_timeout):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+
+    def allow(self):
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            # reset_timeout이 지나면 요청 하나씩 통과시켜 복구 여부를 확인 (half-open)
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                self.opened_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.failure_threshold:
+                if self.opened_at is None:
+                    logger.warning(
+                        "카카오 API circuit breaker open (연속 실패 %s회)",
+                        self.failures,
+                    )
+                self.opened_at = time.monotonic()
+
+
+@lru_cache(maxsize=None)
+def get_session():
+    config = settings.KAKAO_CLIENT
+    retry = Retry(
+        total=config["MAX_RETRIES"],
+        connect=config["MAX_RETRIES"],
+        # 인가 코드는 한 번만 사용할 수 있으므로, 요청이 전달됐을 수 있는 read timeout은 재시도하지 않음
+        read=0,
+        status=config["MAX_RETRIES"],
+        status_forcelist=(502, 503, 504),
+        backoff_factor=config["RETRY_BACKOFF"],
+        allowed_methods=frozenset({"GET"}),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_maxsize=config["POOL_MAXSIZE"], max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return session
+
+
+@lru_cache(maxsize=None)
+def get_circuit_breaker():
+    config = settings.KAKAO_CLIENT
+    return CircuitBreaker(
+        failure_threshold=config["FAILURE_THRESHOLD"],
+        reset_timeout=config["RESET_TIMEOUT"],
+    )
+
+
+def _get(url, **kwargs):
+    config = settings.KAKAO_CLIENT
+    breaker = get_circuit_breaker()
+    if not breaker.allow():
+        raise KakaoUnavailable("circuit open")
+
+    try:
+        response = get_session().get(
+            url, timeout=(config["CONNECT_TIMEOUT"], config["READ_TIMEOUT"]), **kwargs
+        )
+    except requests.RequestException as e:
+        breaker.record_failure()
+        raise KakaoUnavailable(str(e)) from e
+
+    # 잘못된 인가 코드 등 4xx 응답은 카카오 장애가 아니므로 실패로 세지 않음
+    if response.status_code >= 500:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def request_access_token(code, client_id, client_secret, redirect_uri):
+    return _get(
+        KAKAO_TOKEN_URL,
+        params={
+            "grant_type": "authorization_code",
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "redirect_uri": redirect_uri,
+            "code": code,
+        },
+    )
+
+
+def request_user_profile(access_token):
+    return _get(KAKAO_USER_ME_URL, headers={"Authorization": f"Bearer {access_token}"})
@@ -0,0 +1,82 @@
+# 유저별 LLM 사용 횟수 제한
+# CustomUser.available_chat_count를 조건부 UPDATE(F())로 차감하므로 동시 요청에도 횟수를 초과하지 않고,
+# user row 전체를 다시 저장하지 않습니다.
+# reset_chat_date가 오늘보다 이전이면 그날 첫 요청에서 DAILY_LIMIT으로 다시 채우므로 별도의 cron이 필요 없습니다.
+from contextlib import asynccontextmanager, contextmanager
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import F, Q
+from django.utils import timezone
+
+from accounts.authentication import invalidate_cached_user
+
+QUOTA_EXCEEDED_MESSAGE = "오늘 사용할 수 있는 AI 요청 횟수를 모두 사용했습니다. 내일 다시 시도해 주세요."
+
+
+class QuotaExceeded(Exception):
+    pass
+
+
+def _cost(kind):
+    return settings.LLM_QUOTA["COSTS"].get(kind, 1)
+
+
+def consume_quota(user, kind):
+    config = settings.LLM_QUOTA
+    if not config["ENABLED"]:
+        return
+
+    cost = _cost(kind)
+    if cost > config["DAILY_LIMIT"]:
+        raise QuotaExceeded
+
+    today = timezone.localdate()
+    users = get_user_model().objects.filter(pk=user.pk)
+    # 오늘 첫 요청이면 횟수를 다시 채우면서 차감
+    updated = users.filter(
+        Q(reset_chat_date__isnull=True) | Q(reset_chat_date__lt=today)
+    ).update(available_chat_count=config["DAILY_LIMIT"] - cost, reset_chat_date=today)
+    if not updated:
+        updated = users.filter(available_chat_count__gte=cost).update(
+            available_chat_count=F("available_chat_count") - cost
+        )
+    if not updated:
+        raise QuotaExceeded
+
+    invalidate_cached_user(user.pk)
+
+
+def refund_quota(user, kind):
+    # LLM 호출이 실패한 경우 차감한 횟수를 돌려줌 (날짜가 바뀌었으면 이미 초기화되었으므로 무시)
+    if not settings.LLM_QUOTA["ENABLED"]:
+        return
+    get_user_model().objects.filter(
+        pk=user.pk, reset_chat_date=timezone.localdate()
+    ).update(available_chat_count=F("available_chat_count") + _cost(kind))
+    invalidate_cached_user(user.pk)
+
+
+aconsume_quota = sync_to_async(consume_quota)
+arefund_quota = sync_to_async(refund_quota)
+
+
+@contextmanager
+def llm_quota(user, kind):
+    consume_quota(user, kind)
+    try:
+        yield
+    except Exception:
+        refund_quota(user, kind)
+        raise
+
+
+@asynccontextmanager
+async def allm_quota(user, kind):
+    await aconsume_quota(user, kind)
+    try:
+        yield
+    except Exception:
+        await arefund_quota(user, kind)
+        raise
@@ -29,6 +29,14 @@ class UserInfoUpdateSerializer(serializers.ModelSerializer):
         model = User
         fields = ("id", "username", "position", "profile_image")
 
+    def update(self, instance, validated_data):
+        # request.user는 인증 cache에서 만든 객체일 수 있으므로 변경한 필드만 저장
+        # (row 전체를 저장하면 사용 횟수 차감 등 다른 요청의 변경을 덮어쓸 수 있음)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
 
 class GetUserInfoSerializer(serializers.ModelSerializer):
     class Meta:
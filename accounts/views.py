@@ -10,7 +10,6 @@ from drf_spectacular.utils import (
 )
 from rest_framework_simplejwt.tokens import RefreshToken
 
-import requests
 from django.shortcuts import redirect
 from django.contrib.auth import get_user_model
 from rest_framework.permissions import AllowAny, IsAuthenticated
@@ -19,6 +18,7 @@ from rest_framework.views import APIView
 from rest_framework import status
 
 from dj_rest_auth.registration.views import SocialLoginView
+from .kakao import KakaoUnavailable, request_access_token, request_user_profile
 from .serializers import (
     UserInfoUpdateSerializer,
     GetUserInfoSerializer, KakaoTokenSerializer,
@@ -96,26 +96,32 @@ class KakaoLoginView(APIView):
                 {"error": "Code is required"}, status=status.HTTP_400_BAD_REQUEST
             )
 
-        # 카카오 인가코드를 사용해 access_token 획득
-        token_res = requests.get(
-            f"https://kauth.kakao.com/oauth/token?grant_type=authorization_code&client_id={REST_API_KEY}&client_secret={CLIENT_SECRET}&redirect_uri={KAKAO_CALLBACK_URI}&code={code}"
-        )
-        logger.fatal(token_res)
-
-        if token_res.status_code != 200:
-            logger.fatal(token_res.json())
+        try:
+            # 카카오 인가코드를 사용해 access_token 획득
+            token_res = request_access_token(
+                code, REST_API_KEY, CLIENT_SECRET, KAKAO_CALLBACK_URI
+            )
+            logger.fatal(token_res)
+
+            if token_res.status_code != 200:
+                logger.fatal(token_res.json())
+                return Response(
+                    {"error": "Failed to obtain access token"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+
+            token_json = token_res.json()
+            access_token = token_json.get("access_token")
+
+            # 카카오 access_token으로부터 사용자 정보 획득
+            profile_res = request_user_profile(access_token)
+        except KakaoUnavailable as e:
+            logger.error("카카오 API 호출 실패: %s", e)
             return Response(
-                {"error": "Failed to obtain access token"},
-                status=status.HTTP_400_BAD_REQUEST,
+                {"error": "Kakao login is temporarily unavailable"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
 
-        token_json = token_res.json()
-        access_token = token_json.get("access_token")
-
-        # 카카오 access_token으로부터 사용자 정보 획득
-        headers = {"Authorization": f"Bearer {access_token}"}
-        profile_res = requests.get("https://kapi.kakao.com/v2/user/me", headers=headers)
-
         if profile_res.status_code != 200:
             return Response(
                 {"error": "Failed to obtain user information"},
@@ -0,0 +1,26 @@
+# Generated by Django 5.0.3 on 2026-10-17 12:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memos", "0003_remove_memo_is_finished_remove_memo_is_scrapped"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="memo",
+            options={"ordering": ["-updated_at", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="memo",
+            index=models.Index(
+                fields=["user", "-updated_at", "-id"],
+                name="memos_memo_user_id_c749f7_idx",
+            ),
+        ),
+    ]
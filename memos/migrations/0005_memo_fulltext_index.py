@@ -0,0 +1,31 @@
+from django.db import migrations
+
+
+# ngram parser는 MySQL에서만 지원되므로 다른 DB(MariaDB, sqlite 등)에서는 인덱스를 만들지 않음
+# (이 경우 memos/search.py는 icontains 검색을 사용)
+def _supports_ngram(connection):
+    return connection.vendor == "mysql" and not connection.mysql_is_mariadb
+
+
+def create_fulltext_index(apps, schema_editor):
+    if _supports_ngram(schema_editor.connection):
+        schema_editor.execute(
+            "CREATE FULLTEXT INDEX memos_memo_title_content_ft "
+            "ON memos_memo (title, content) WITH PARSER ngram"
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if _supports_ngram(schema_editor.connection):
+        schema_editor.execute("DROP INDEX memos_memo_title_content_ft ON memos_memo")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("memos", "0004_memo_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fulltext_index, drop_fulltext_index),
+    ]
@@ -10,5 +10,12 @@ class Memo(models.Model):
     content = models.TextField()
     updated_at = models.DateTimeField(auto_now=True)
 
+    class Meta:
+        # 유저별 목록 조회가 (user, updated_at, id) 인덱스만으로 정렬까지 처리되도록 ordering과 인덱스를 맞춤
+        ordering = ["-updated_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "-updated_at", "-id"]),
+        ]
+
     def __str__(self):
         return self.title
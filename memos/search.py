@@ -0,0 +1,75 @@
+# 메모 검색
+# MySQL에서는 ngram parser를 사용하는 FULLTEXT 인덱스(memos/migrations/0005)로 검색하고 관련도 순으로 정렬합니다.
+# MariaDB, sqlite 등 ngram parser가 없는 DB에서는 기존과 같이 icontains로 검색합니다.
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+from .models import Memo
+
+MATCH_SQL = "MATCH (title, content) AGAINST (%s IN BOOLEAN MODE)"
+
+# MySQL의 기본 ngram_token_size. 이보다 짧은 키워드는 FULLTEXT 인덱스로 찾을 수 없음
+NGRAM_TOKEN_SIZE = 2
+
+
+def fulltext_enabled():
+    backend = settings.MEMO_SEARCH["BACKEND"]
+    if backend == "auto":
+        return connection.vendor == "mysql" and not connection.mysql_is_mariadb
+    return backend == "fulltext"
+
+
+def _boolean_query(keyword):
+    # 키워드 전체를 하나의 구문으로 검색 (icontains와 같은 의미)
+    # boolean mode 연산자로 해석될 수 있는 문자는 공백으로 바꿈
+    return '"' + re.sub(r'["+\-<>()~*@]', " ", keyword).strip() + '"'
+
+
+def search_memos(user, keyword):
+    memos = Memo.objects.filter(user=user)
+    keyword = keyword.strip()
+    if not keyword:
+        return memos
+
+    if fulltext_enabled() and len(keyword) >= NGRAM_TOKEN_SIZE:
+        params = [_boolean_query(keyword)]
+        return (
+            memos.filter(RawSQL(MATCH_SQL, params, output_field=BooleanField()))
+            .annotate(score=RawSQL(MATCH_SQL, params, output_field=FloatField()))
+            .order_by("-score", "-updated_at", "-id")
+        )
+
+    return memos.filter(Q(title__icontains=keyword) | Q(content__icontains=keyword))
+
+
+def highlight(text, keyword, width=60):
+    """keyword가 처음 등장하는 위치 주변을 잘라 <em>으로 감싼 snippet을 반환합니다."""
+    keyword = keyword.strip()
+    if not text or not keyword:
+        return escape(text[: width * 2]) if text else ""
+
+    position = text.lower().find(keyword.lower())
+    if position < 0:
+        return escape(text[: width * 2])
+
+    start = max(position - width, 0)
+    end = min(position + len(keyword) + width, len(text))
+    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+
+    snippet = text[start:end]
+    highlighted = ""
+    last = 0
+    for match in pattern.finditer(snippet):
+        highlighted += escape(snippet[last : match.start()])
+        highlighted += "<em>" + escape(match.group()) + "</em>"
+        last = match.end()
+    highlighted += escape(snippet[last:])
+
+    prefix = "..." if start > 0 else ""
+    suffix = "..." if end < len(text) else ""
+    return prefix + highlighted + suffix
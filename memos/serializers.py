@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from .models import Memo
+from .search import highlight
 
 
 class MemoSerializer(serializers.ModelSerializer):
@@ -8,6 +9,18 @@ class MemoSerializer(serializers.ModelSerializer):
         fields = "__all__"  # 모든 필드를 포함
 
 
+class MemoSearchResultSerializer(MemoSerializer):
+    # 검색 키워드가 포함된 부분을 <em>으로 감싼 snippet
+    highlight = serializers.SerializerMethodField()
+
+    def get_highlight(self, obj):
+        keyword = self.context.get("keyword", "")
+        return {
+            "title": highlight(obj.title, keyword),
+            "content": highlight(obj.content, keyword),
+        }
+
+
 class PostMemoSerializer(serializers.ModelSerializer):
     class Meta:
         model = Memo
@@ -1,10 +1,8 @@
 from django.http import Http404
-from django.db.models import Q
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
-from rest_framework.pagination import PageNumberPagination
 from rest_framework import serializers
 from django.http import JsonResponse
 
@@ -14,8 +12,14 @@ from drf_spectacular.utils import (
     OpenApiParameter,
 )
 
+from resumai.pagination import (
+    CURSOR_PAGINATION_PARAMETERS,
+    CursorOrPageNumberPagination,
+)
+
 from .models import Memo
-from .serializers import PostMemoSerializer, MemoSerializer
+from .search import search_memos
+from .serializers import PostMemoSerializer, MemoSerializer, MemoSearchResultSerializer
 
 
 class PostMemoView(APIView):
@@ -50,12 +54,13 @@ class PostMemoView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class GetAllMemoView(APIView, PageNumberPagination):
+class GetAllMemoView(APIView, CursorOrPageNumberPagination):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
         summary="전체 메모 조회",
-        description="사용자가 작성한 전체 메모를 받아옵니다.",
+        description="사용자가 작성한 전체 메모를 최근 수정 순으로 받아옵니다.",
+        parameters=CURSOR_PAGINATION_PARAMETERS,
         responses={
             200: inline_serializer(
                 name="GetAllMemoResponse",
@@ -137,7 +142,7 @@ class DeleteMemoView(APIView):
         )
 
 
-class CustomPagination(PageNumberPagination):
+class CustomPagination(CursorOrPageNumberPagination):
     # 클라이언트로부터 'size' 파라미터를 받아 페이지 크기를 결정
     page_size_query_param = "size"
 
@@ -183,7 +188,7 @@ class SearchMemoView(APIView, CustomPagination):
 
     @extend_schema(
         summary="메모 검색",
-        description="키워드를 기반으로 메모를 검색합니다.",
+        description="키워드를 기반으로 메모를 검색합니다. 결과는 관련도 순으로 정렬되며, `highlight`에 키워드가 `<em>`으로 강조된 snippet이 담깁니다.",
         responses={
             200: inline_serializer(
                 name="SearchResponse",
@@ -191,7 +196,7 @@ class SearchMemoView(APIView, CustomPagination):
                     "count": serializers.IntegerField(),
                     "next": serializers.URLField(),
                     "previous": serializers.URLField(),
-                    "results": PostMemoSerializer(many=True),
+                    "results": MemoSearchResultSerializer(many=True),
                 },
             )
         },
@@ -207,21 +212,22 @@ class SearchMemoView(APIView, CustomPagination):
             OpenApiParameter(
                 name="size", type=int, description="한 화면에 표시할 메모의 개수입니다."
             ),
+            # cursor 방식에서는 관련도 대신 최근 수정 순으로 정렬됩니다.
+            *CURSOR_PAGINATION_PARAMETERS,
         ],
     )
     def get(self, request):
         keyword = request.query_params.get("keyword", "")
 
-        query_set = Memo.objects.filter(
-            Q(user=request.user)
-            & (Q(title__icontains=keyword) | Q(content__icontains=keyword))
-        )
+        # 관련도 순으로 정렬된 검색 결과 (memos/search.py)
+        query_set = search_memos(request.user, keyword)
+        context = {"keyword": keyword}
 
         page = self.paginate_queryset(query_set, request, view=self)
         if page is not None:
-            serializer = MemoSerializer(page, many=True)
+            serializer = MemoSearchResultSerializer(page, many=True, context=context)
             return self.get_paginated_response(serializer.data)
 
         # Pagination이 적용되지 않는 경우의 대비책(예: size 파라미터 누락 등)
-        serializer = MemoSerializer(query_set, many=True)
+        serializer = MemoSearchResultSerializer(query_set, many=True, context=context)
         return Response(serializer.data)
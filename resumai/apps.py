@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class ResumaiConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "resumai"
+
+    def ready(self):
+        from django.db.backends.signals import connection_created
+
+        from resumai.instrumentation import install_db_instrumentation
+
+        connection_created.connect(install_db_instrumentation)
@@ -0,0 +1,287 @@
+# 오프라인 벤치마크 도구
+# - FakeOpenAIHandler: OpenAI chat completions(스트리밍 포함) / embeddings API를 흉내 내는 로컬 서버
+#   (응답 지연과 초당 토큰 수를 설정할 수 있음, `manage.py run_fake_openai`)
+# - fake_embedding: 텍스트마다 고정된 임베딩을 만들어 fake 서버와 local retriever index가 같은 벡터 공간을 사용
+# - SCENARIOS / run_scenario: 동시 사용자 N명으로 API를 호출하고 endpoint별 처리량과 지연시간 분위수를 계산
+#   (`manage.py run_benchmark`)
+import hashlib
+import json
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler
+
+import numpy as np
+
+EMBEDDING_DIM = 1536
+FAKE_GUIDELINES = [
+    "지원 동기와 회사의 연결점에 대해 작성해 주세요.",
+    "직무와 관련된 경험을 구체적으로 서술해 주세요.",
+    "입사 후 이루고 싶은 목표에 대해 서술해 주세요.",
+]
+
+
+def fake_embedding(text, dim=EMBEDDING_DIM):
+    seed = int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little")
+    vector = np.random.default_rng(seed).standard_normal(dim).astype(np.float32)
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+def fake_token_count(text):
+    # 한국어는 대략 한 글자가 한 토큰에 가까우므로 글자 수의 절반 정도로 근사
+    return max(1, len(text) // 2)
+
+
+def fake_completion_tokens(body, completion_tokens):
+    # JSON mode 요청(가이드라인)에는 JSON 객체로 응답
+    if body.get("response_format", {}).get("type") == "json_object":
+        return [json.dumps({"guidelines": FAKE_GUIDELINES}, ensure_ascii=False)]
+    return ["자기소개서 "] * completion_tokens
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # run_fake_openai에서 설정
+    latency = 0.5
+    tokens_per_second = 50.0
+    completion_tokens = 300
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if self.path.endswith("/chat/completions"):
+            self.chat_completions(body)
+        elif self.path.endswith("/embeddings"):
+            self.embeddings(body)
+        else:
+            self.send_json(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    def send_json(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def chat_completions(self, body):
+        prompt = "".join(message["content"] for message in body["messages"])
+        tokens = fake_completion_tokens(body, self.completion_tokens)
+        usage = {
+            "prompt_tokens": fake_token_count(prompt),
+            "completion_tokens": len(tokens),
+            "total_tokens": fake_token_count(prompt) + len(tokens),
+        }
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        common = {
+            "id": completion_id,
+            "created": int(time.time()),
+            "model": body["model"],
+        }
+
+        time.sleep(self.latency)
+        if not body.get("stream"):
+            time.sleep(len(tokens) / self.tokens_per_second)
+            self.send_json(
+                200,
+                {
+                    **common,
+                    "object": "chat.completion",
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {
+                                "role": "assistant",
+                                "content": "".join(tokens),
+                            },
+                            "finish_reason": "stop",
+                        }
+                    ],
+                    "usage": usage,
+                },
+            )
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        for token in tokens + [None]:
+            chunk = {
+                **common,
+                "object": "chat.completion.chunk",
+                "choices": [
+                    {
+                        "index": 0,
+                        "delta": {"content": token} if token is not None else {},
+                        "finish_reason": None if token is not None else "stop",
+                    }
+                ],
+            }
+            self.wfile.write(
+                f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode()
+            )
+            self.wfile.flush()
+            if token is not None:
+                time.sleep(1 / self.tokens_per_second)
+        if (body.get("stream_options") or {}).get("include_usage"):
+            chunk = {**common, "object": "chat.completion.chunk", "choices": []}
+            chunk["usage"] = usage
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def embeddings(self, body):
+        inputs = body["input"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        time.sleep(self.latency / 10)
+        prompt_tokens = sum(fake_token_count(text) for text in inputs)
+        self.send_json(
+            200,
+            {
+                "object": "list",
+                "data": [
+                    {
+                        "object": "embedding",
+                        "index": index,
+                        "embedding": fake_embedding(text),
+                    }
+                    for index, text in enumerate(inputs)
+                ],
+                "model": body["model"],
+                "usage": {
+                    "prompt_tokens": prompt_tokens,
+                    "total_tokens": prompt_tokens,
+                },
+            },
+        )
+
+
+def percentile(sorted_values, p):
+    # nearest-rank
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def _generate_payload(number):
+    # 같은 프롬프트가 합쳐지거나(single-flight) 임베딩 캐시에서 바로 반환되지 않도록 답변을 매번 다르게 함
+    return {
+        "title": f"벤치마크-{number}",
+        "position": "백엔드 엔지니어",
+        "company": "리주마이",
+        "due_date": "2024-12-31",
+        "question": "지원 동기에 대해 작성해 주세요.",
+        "guidelines": FAKE_GUIDELINES,
+        "answers": [
+            f"서비스에 관심이 많아서 ({uuid.uuid4().hex})",
+            "대용량 트래픽 경험",
+            "성능 개선",
+        ],
+        "free_answer": "",
+        "favor_info": "Python, Django 경험",
+    }
+
+
+# 시나리오: (method, path, 요청 kwargs)를 만드는 함수. user는 {"token", "resume_ids"}
+SCENARIOS = {
+    "guideline": lambda user, n: (
+        "get",
+        "/resume/guidelines",
+        # 가이드라인 캐시를 거치지 않고 LLM 호출 경로를 측정하도록 질문을 매번 다르게 함
+        {
+            "params": {
+                "question": f"지원 동기에 대해 작성해 주세요. ({uuid.uuid4().hex})"
+            }
+        },
+    ),
+    "generate": lambda user, n: (
+        "post",
+        "/resume/generate",
+        {"json": _generate_payload(n)},
+    ),
+    "generate_stream": lambda user, n: (
+        "post",
+        "/resume/generate/stream",
+        {"json": _generate_payload(n), "stream": True},
+    ),
+    "chat": lambda user, n: (
+        "post",
+        f"/resume/{user['resume_ids'][n % len(user['resume_ids'])]}/chat",
+        {"json": {"query": f"조금 더 간결하게 다듬어 주세요. ({uuid.uuid4().hex})"}},
+    ),
+    "list": lambda user, n: ("get", "/resume/all", {"params": {"page": 1}}),
+    "list_cursor": lambda user, n: (
+        "get",
+        "/resume/all",
+        {"params": {"pagination": "cursor"}},
+    ),
+    "search": lambda user, n: (
+        "get",
+        "/memos/search",
+        {"params": {"keyword": "프로젝트"}},
+    ),
+}
+
+
+def run_scenario(base_url, scenario, users, concurrency, total_requests, timeout):
+    import requests
+
+    build_request = SCENARIOS[scenario]
+    counter = iter(range(total_requests))
+    counter_lock = threading.Lock()
+
+    def worker(worker_index):
+        # 가상 사용자마다 keep-alive session 하나를 사용
+        session = requests.Session()
+        user = users[worker_index % len(users)]
+        results = []
+        while True:
+            with counter_lock:
+                number = next(counter, None)
+            if number is None:
+                return results
+            method, path, kwargs = build_request(user, number)
+            started = time.perf_counter()
+            try:
+                response = session.request(
+                    method,
+                    base_url + path,
+                    headers={"Authorization": f"Bearer {user['token']}"},
+                    timeout=timeout,
+                    **kwargs,
+                )
+                # 스트리밍 응답은 마지막 이벤트까지 받은 시점을 기준으로 측정
+                body = b"".join(response.iter_content(chunk_size=None))
+                ok = response.status_code < 400 and b"event: error" not in body
+            except requests.RequestException:
+                ok = False
+            results.append((time.perf_counter() - started, ok))
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = [
+            item
+            for worker_results in executor.map(worker, range(concurrency))
+            for item in worker_results
+        ]
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(duration for duration, ok in results if ok)
+    return {
+        "scenario": scenario,
+        "requests": len(results),
+        "errors": sum(1 for _, ok in results if not ok),
+        "throughput": len(results) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+    }
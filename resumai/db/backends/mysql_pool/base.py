@@ -0,0 +1,52 @@
+# 커넥션 풀을 사용하는 MySQL backend
+# Django는 요청이 끝나면 DB 커넥션을 닫지만, 이 backend에서는 close()가 실제로 커넥션을 끊지 않고
+# 프로세스 내 풀(SQLAlchemy QueuePool)에 반납하므로 매 요청마다 TCP 연결과 인증을 반복하지 않습니다.
+# 풀은 프로세스 단위로 공유되며 스레드(sync_to_async 포함)마다 별도의 커넥션을 빌려 쓰므로 async worker에서도 안전합니다.
+#
+# settings.DATABASES 예시
+#   "ENGINE": "resumai.db.backends.mysql_pool",
+#   "CONN_MAX_AGE": 0,  # 요청이 끝나면 풀에 반납 (다른 값으로 설정해도 0으로 고정)
+#   "POOL_OPTIONS": {"POOL_SIZE": 5, "MAX_OVERFLOW": 10, "RECYCLE": 3600, "TIMEOUT": 10},
+import threading
+
+from django.db.backends.mysql import base as mysql_base
+from sqlalchemy import event, exc
+from sqlalchemy.pool import QueuePool
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _ping_on_checkout(dbapi_connection, connection_record, connection_proxy):
+    # 풀에서 꺼낼 때마다 커넥션이 살아 있는지 확인하고, 끊어진 커넥션은 버리고 새로 연결
+    try:
+        dbapi_connection.ping()
+    except Exception:
+        raise exc.DisconnectionError()
+
+
+class DatabaseWrapper(mysql_base.DatabaseWrapper):
+    def __init__(self, settings_dict, *args, **kwargs):
+        super().__init__(settings_dict, *args, **kwargs)
+        # persistent connection을 사용하면 Django가 풀 위에서 커넥션을 따로 붙잡아 두므로 항상 0
+        self.settings_dict["CONN_MAX_AGE"] = 0
+
+    def get_pool(self, conn_params):
+        with _pools_lock:
+            pool = _pools.get(self.alias)
+            if pool is None:
+                options = self.settings_dict.get("POOL_OPTIONS", {})
+                pool = QueuePool(
+                    lambda: super(DatabaseWrapper, self).get_new_connection(conn_params),
+                    pool_size=options.get("POOL_SIZE", 5),
+                    max_overflow=options.get("MAX_OVERFLOW", 10),
+                    recycle=options.get("RECYCLE", 3600),
+                    timeout=options.get("TIMEOUT", 10),
+                )
+                event.listen(pool, "checkout", _ping_on_checkout)
+                _pools[self.alias] = pool
+            return pool
+
+    def get_new_connection(self, conn_params):
+        # 풀의 커넥션 proxy를 반환 (close() 시 풀에 반납됨)
+        return self.get_pool(conn_params).connect()
@@ -0,0 +1,271 @@
+# 요청별 구간 측정과 Prometheus 형식 metric
+# span("chat_completion") 등으로 감싼 구간의 시간과 OpenAI 토큰 사용량을 요청 단위로 모아
+# 요청이 끝나면 구조화된 로그(resumai.request)로 남기고, /metrics에서 누적 값을 노출합니다.
+# metric은 프로세스별로 집계되므로 worker가 여러 개이면 Prometheus에서 instance별로 합산해야 합니다.
+import bisect
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger("resumai.request")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_request_stats = ContextVar("request_stats", default=None)
+
+
+class Histogram:
+    def __init__(self, name, help_text, buckets=DURATION_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, 0]
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def expose(self):
+        lines = [
+            f"# HELP {self.name} {self.help_text}",
+            f"# TYPE {self.name} histogram",
+        ]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    lines.append(
+                        f"{self.name}_bucket{_labels(key, le=bound)} {cumulative}"
+                    )
+                lines.append(f'{self.name}_bucket{_labels(key, le="+Inf")} {count}')
+                lines.append(f"{self.name}_sum{_labels(key)} {total}")
+                lines.append(f"{self.name}_count{_labels(key)} {count}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, value=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.append(f"{self.name}{_labels(key)} {value}")
+        return lines
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(key, **extra):
+    items = list(key) + list(extra.items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in items) + "}"
+
+
+REQUEST_DURATION = Histogram(
+    "resumai_http_request_duration_seconds", "HTTP 요청 처리 시간"
+)
+SPAN_DURATION = Histogram("resumai_span_duration_seconds", "구간(span)별 소요 시간")
+LLM_TOKENS = Counter("resumai_llm_tokens_total", "OpenAI 토큰 사용량")
+PROMPT_SECTION_TOKENS = Counter(
+    "resumai_llm_prompt_section_tokens_total", "프롬프트 구간별 입력 토큰 수 (tiktoken)"
+)
+LLM_OUTPUT_PARSE = Counter(
+    "resumai_llm_output_parse_total", "LLM 응답 파싱 결과 (ok / repaired / failed)"
+)
+LLM_FALLBACK = Counter(
+    "resumai_llm_fallback_total", "응답 검증 실패로 FALLBACK_MODEL을 다시 호출한 횟수"
+)
+
+METRICS = (
+    REQUEST_DURATION,
+    SPAN_DURATION,
+    LLM_TOKENS,
+    PROMPT_SECTION_TOKENS,
+    LLM_OUTPUT_PARSE,
+    LLM_FALLBACK,
+)
+
+
+def render_metrics():
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.expose())
+    return "\n".join(lines) + "\n"
+
+
+class RequestStats:
+    def __init__(self):
+        self.spans = {}
+        self.tokens = {}
+        self.prompts = []
+        self._lock = threading.Lock()
+
+    def add_span(self, name, seconds):
+        with self._lock:
+            total, count = self.spans.get(name, (0.0, 0))
+            self.spans[name] = (total + seconds, count + 1)
+
+    def add_tokens(self, model, token_type, count):
+        with self._lock:
+            key = (model, token_type)
+            self.tokens[key] = self.tokens.get(key, 0) + count
+
+    def add_prompt(self, name, model, section_tokens):
+        with self._lock:
+            self.prompts.append(
+                {"name": name, "model": model, "sections": section_tokens}
+            )
+
+    def as_log_fields(self):
+        fields = {
+            "spans": {
+                name: {"ms": round(total * 1000, 1), "count": count}
+                for name, (total, count) in self.spans.items()
+            },
+            "tokens": {
+                f"{model}:{token_type}": count
+                for (model, token_type), count in self.tokens.items()
+            },
+        }
+        if self.prompts:
+            fields["prompts"] = self.prompts
+        return fields
+
+
+def start_request():
+    return _request_stats.set(RequestStats())
+
+
+def detach_request(token):
+    # 요청 stats를 현재 context에서 떼어냄
+    # 스트리밍 응답은 body를 보내는 동안 use_request_stats로 다시 연결해 구간 / 토큰 사용량을 같은 요청에 기록
+    stats = _request_stats.get()
+    _request_stats.reset(token)
+    return stats
+
+
+@contextmanager
+def use_request_stats(stats):
+    token = _request_stats.set(stats)
+    try:
+        yield
+    finally:
+        _request_stats.reset(token)
+
+
+def finish_request(stats, method, route, status_code, duration):
+    REQUEST_DURATION.observe(duration, method=method, route=route, status=status_code)
+    for (model, token_type), count in stats.tokens.items():
+        LLM_TOKENS.inc(count, model=model, type=token_type, route=route)
+
+    logger.info(
+        json.dumps(
+            {
+                "method": method,
+                "route": route,
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 1),
+                **stats.as_log_fields(),
+            },
+            ensure_ascii=False,
+        )
+    )
+
+
+def record_span(name, seconds):
+    SPAN_DURATION.observe(seconds, span=name)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.add_span(name, seconds)
+
+
+@contextmanager
+def span(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_span(name, time.perf_counter() - started)
+
+
+def _cached_tokens(usage):
+    # prompt caching으로 재사용된 입력 토큰 수 (prompt_tokens에 포함됨)
+    # 설치된 SDK 버전의 응답 모델에 필드가 없으면 dict로 들어옴
+    details = getattr(usage, "prompt_tokens_details", None)
+    if isinstance(details, dict):
+        return details.get("cached_tokens")
+    return getattr(details, "cached_tokens", None)
+
+
+def record_token_usage(model, usage):
+    if usage is None:
+        return
+    counts = {"prompt": usage.prompt_tokens}
+    # embeddings 응답에는 completion_tokens가 없음
+    if getattr(usage, "completion_tokens", None) is not None:
+        counts["completion"] = usage.completion_tokens
+    cached = _cached_tokens(usage)
+    if cached is not None:
+        counts["cached"] = cached
+    stats = _request_stats.get()
+    for token_type, count in counts.items():
+        if stats is not None:
+            stats.add_tokens(model, token_type, count)
+        else:
+            # 요청 밖(백그라운드 작업 등)에서의 사용량은 바로 집계
+            LLM_TOKENS.inc(count, model=model, type=token_type, route="")
+
+
+def db_execute_wrapper(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        record_span("db", time.perf_counter() - started)
+
+
+def install_db_instrumentation(sender, connection, **kwargs):
+    # connection_created signal receiver: 새로 연결될 때마다 query 시간 측정 wrapper를 등록
+    if db_execute_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(db_execute_wrapper)
+
+
+def record_prompt(name, model, section_tokens):
+    for section, count in section_tokens.items():
+        PROMPT_SECTION_TOKENS.inc(count, prompt=name, section=section)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.add_prompt(name, model, section_tokens)
+    else:
+        logger.info(
+            json.dumps(
+                {"prompt": name, "model": model, "sections": section_tokens},
+                ensure_ascii=False,
+            )
+        )
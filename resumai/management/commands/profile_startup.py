@@ -0,0 +1,89 @@
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand, CommandError
+
+# 새 프로세스에서 django.setup()과 URLconf 로드까지 (worker가 요청을 받기 전까지 하는 일) 실행
+STARTUP_SCRIPT = """
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+
+
+def parse_importtime(output):
+    # `python -X importtime`의 stderr 형식:
+    # import time: self [us] | cumulative | imported package
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:") :].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+class Command(BaseCommand):
+    help = "서버 시작 시(django.setup + URLconf 로드) 모듈별 import 시간을 측정합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--limit", type=int, default=25, help="출력할 모듈 수 (기본값: 25)"
+        )
+        parser.add_argument(
+            "--by-package",
+            action="store_true",
+            help="최상위 패키지 단위로 합산합니다. (예: openai, pinecone, numpy)",
+        )
+        parser.add_argument(
+            "--import",
+            dest="extra_imports",
+            action="append",
+            default=[],
+            help="시작 후 추가로 import할 모듈 (여러 번 지정 가능, 예: --import resume.async_views)",
+        )
+
+    def handle(self, *args, **options):
+        script = STARTUP_SCRIPT + "".join(
+            f"import {module}\n" for module in options["extra_imports"]
+        )
+
+        started = time.perf_counter()
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", script],
+            capture_output=True,
+            text=True,
+            env=os.environ.copy(),
+        )
+        elapsed = time.perf_counter() - started
+        if result.returncode != 0:
+            raise CommandError(result.stderr.splitlines()[-1])
+
+        rows = parse_importtime(result.stderr)
+        if options["by_package"]:
+            totals = defaultdict(int)
+            for module, self_us, _ in rows:
+                totals[module.split(".")[0]] += self_us
+            ranked = sorted(totals.items(), key=lambda item: -item[1])
+            header = "self(ms)  package"
+        else:
+            ranked = sorted(
+                ((module, cumulative_us) for module, _, cumulative_us in rows),
+                key=lambda item: -item[1],
+            )
+            header = "cumulative(ms)  module"
+
+        self.stdout.write(header)
+        for name, us in ranked[: options["limit"]]:
+            self.stdout.write(f"{us / 1000:>10.1f}  {name}")
+
+        total_ms = sum(self_us for _, self_us, _ in rows) / 1000
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"모듈 {len(rows)}개, import 합계 {total_ms:.0f}ms, 프로세스 전체 {elapsed * 1000:.0f}ms"
+            )
+        )
@@ -0,0 +1,97 @@
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from resume.models import Resume
+from resumai.benchmark import SCENARIOS, run_scenario
+from resumai.management.commands.seed_benchmark_data import BENCH_EMAIL_DOMAIN
+
+DEFAULT_SCENARIOS = "guideline,generate,chat,list,search"
+
+
+class Command(BaseCommand):
+    help = (
+        "seed_benchmark_data로 만든 유저로 실행 중인 서버에 동시 요청을 보내고 "
+        "시나리오별 처리량과 지연시간 분위수(p50/p95/p99)를 출력합니다. "
+        f"시나리오: {', '.join(SCENARIOS)}"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+        parser.add_argument(
+            "--scenarios",
+            default=DEFAULT_SCENARIOS,
+            help=f"쉼표로 구분한 시나리오 목록 (기본값: {DEFAULT_SCENARIOS})",
+        )
+        parser.add_argument(
+            "--concurrency", type=int, default=10, help="동시 사용자 수"
+        )
+        parser.add_argument(
+            "--requests", type=int, default=100, help="시나리오별 전체 요청 수"
+        )
+        parser.add_argument("--timeout", type=float, default=120.0)
+        parser.add_argument("--output", help="결과를 JSON으로 저장할 파일 경로")
+
+    def handle(self, *args, **options):
+        scenarios = [name.strip() for name in options["scenarios"].split(",")]
+        unknown = [name for name in scenarios if name not in SCENARIOS]
+        if unknown:
+            raise CommandError(f"알 수 없는 시나리오입니다: {', '.join(unknown)}")
+
+        users = self._load_users()
+        base_url = options["base_url"].rstrip("/")
+
+        self.stdout.write(
+            f"{'scenario':<16}{'requests':>9}{'errors':>8}{'rps':>9}"
+            f"{'p50(ms)':>10}{'p95(ms)':>10}{'p99(ms)':>10}{'max(ms)':>10}"
+        )
+        results = []
+        for scenario in scenarios:
+            result = run_scenario(
+                base_url,
+                scenario,
+                users,
+                concurrency=options["concurrency"],
+                total_requests=options["requests"],
+                timeout=options["timeout"],
+            )
+            results.append(result)
+            self.stdout.write(
+                f"{scenario:<16}{result['requests']:>9}{result['errors']:>8}"
+                f"{result['throughput']:>9.1f}{result['p50_ms']:>10.0f}"
+                f"{result['p95_ms']:>10.0f}{result['p99_ms']:>10.0f}{result['max_ms']:>10.0f}"
+            )
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as f:
+                json.dump(
+                    {"concurrency": options["concurrency"], "results": results},
+                    f,
+                    indent=2,
+                )
+
+    def _load_users(self):
+        users = list(
+            get_user_model().objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}")
+        )
+        if not users:
+            raise CommandError(
+                "벤치마크 유저가 없습니다. 먼저 manage.py seed_benchmark_data를 실행하세요."
+            )
+
+        resume_ids = {}
+        for user_id, resume_id in Resume.objects.filter(user__in=users).values_list(
+            "user_id", "id"
+        ):
+            resume_ids.setdefault(user_id, []).append(resume_id)
+
+        return [
+            {
+                "token": str(RefreshToken.for_user(user).access_token),
+                "resume_ids": resume_ids.get(user.pk, []),
+            }
+            for user in users
+            if resume_ids.get(user.pk)
+        ]
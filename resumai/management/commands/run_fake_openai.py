@@ -0,0 +1,53 @@
+from http.server import ThreadingHTTPServer
+
+from django.core.management.base import BaseCommand
+
+from resumai.benchmark import FakeOpenAIHandler
+
+
+class Command(BaseCommand):
+    help = (
+        "벤치마크용 fake OpenAI 서버를 실행합니다. "
+        "서버 쪽에서 OPENAI_BASE_URL=http://<host>:<port>/v1 로 설정하면 실제 OpenAI 대신 호출됩니다."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--host", default="127.0.0.1")
+        parser.add_argument("--port", type=int, default=8089)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.5,
+            help="첫 토큰까지의 지연 시간(초) (기본값: 0.5)",
+        )
+        parser.add_argument(
+            "--tokens-per-second",
+            type=float,
+            default=50.0,
+            help="초당 생성 토큰 수 (기본값: 50)",
+        )
+        parser.add_argument(
+            "--completion-tokens",
+            type=int,
+            default=300,
+            help="자소서 생성 / 챗봇 응답의 토큰 수 (기본값: 300)",
+        )
+
+    def handle(self, *args, **options):
+        FakeOpenAIHandler.latency = options["latency"]
+        FakeOpenAIHandler.tokens_per_second = options["tokens_per_second"]
+        FakeOpenAIHandler.completion_tokens = options["completion_tokens"]
+
+        server = ThreadingHTTPServer(
+            (options["host"], options["port"]), FakeOpenAIHandler
+        )
+        server.daemon_threads = True
+        self.stdout.write(
+            f"fake OpenAI 서버 시작: http://{options['host']}:{options['port']}/v1"
+        )
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
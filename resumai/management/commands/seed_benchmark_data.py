@@ -0,0 +1,131 @@
+import random
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from memos.models import Memo
+from resume.models import ChatHistory, Resume
+from resume.retrievers import write_local_index
+from resumai.benchmark import fake_embedding
+
+BENCH_EMAIL_DOMAIN = "bench.resumai.local"
+
+COMPANIES = ["네이버", "카카오", "라인", "쿠팡", "토스", "당근"]
+POSITIONS = ["백엔드 엔지니어", "프론트엔드 엔지니어", "데이터 엔지니어", "ML 엔지니어"]
+QUESTIONS = ["지원 동기", "성장 과정", "직무 관련 경험", "입사 후 포부", "협업 경험"]
+KEYWORDS = ["프로젝트", "협업", "성능 개선", "장애 대응", "리팩토링", "테스트"]
+
+
+class Command(BaseCommand):
+    help = (
+        "벤치마크용 유저 / 자소서 / 채팅 / 메모 데이터와 local retriever index를 생성합니다. "
+        f"(기존 *@{BENCH_EMAIL_DOMAIN} 유저의 데이터는 삭제 후 다시 생성)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--resumes-per-user", type=int, default=30)
+        parser.add_argument("--chats-per-resume", type=int, default=5)
+        parser.add_argument("--memos-per-user", type=int, default=50)
+        parser.add_argument(
+            "--examples", type=int, default=500, help="retriever index의 자소서 예시 수"
+        )
+        parser.add_argument(
+            "--index-dir", default=settings.RETRIEVER["LOCAL_INDEX_DIR"]
+        )
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        User = get_user_model()
+
+        with transaction.atomic():
+            User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}").delete()
+            users = User.objects.bulk_create(
+                [
+                    User(
+                        email=f"user{i}@{BENCH_EMAIL_DOMAIN}",
+                        username=f"bench{i}",
+                        kakao_oid=None,
+                    )
+                    for i in range(options["users"])
+                ]
+            )
+            # bulk_create가 pk를 돌려주지 않는 backend(MySQL)를 위해 다시 조회
+            users = list(User.objects.filter(email__endswith=f"@{BENCH_EMAIL_DOMAIN}"))
+
+            resumes = []
+            for user in users:
+                for i in range(options["resumes_per_user"]):
+                    company = rng.choice(COMPANIES)
+                    question = rng.choice(QUESTIONS)
+                    resumes.append(
+                        Resume(
+                            user=user,
+                            title=f"{company}-{question}-{i}",
+                            company=company,
+                            position=rng.choice(POSITIONS),
+                            question=question,
+                            content=self._paragraph(rng, 40),
+                        )
+                    )
+            Resume.objects.bulk_create(resumes, batch_size=1000)
+            resumes = Resume.objects.filter(user__in=users).only("id")
+
+            ChatHistory.objects.bulk_create(
+                [
+                    ChatHistory(
+                        resume=resume,
+                        query=self._paragraph(rng, 8),
+                        response=self._paragraph(rng, 40),
+                    )
+                    for resume in resumes
+                    for _ in range(options["chats_per_resume"])
+                ],
+                batch_size=1000,
+            )
+            Memo.objects.bulk_create(
+                [
+                    Memo(
+                        user=user,
+                        title=f"메모 {i}",
+                        content=self._paragraph(rng, 20),
+                    )
+                    for user in users
+                    for i in range(options["memos_per_user"])
+                ],
+                batch_size=1000,
+            )
+
+        items = [
+            {
+                "id": str(i),
+                "metadata": {
+                    "question": f"{rng.choice(QUESTIONS)}에 대해 작성해 주세요.",
+                    "answer": self._paragraph(rng, 60),
+                },
+            }
+            for i in range(options["examples"])
+        ]
+        write_local_index(
+            options["index_dir"],
+            [fake_embedding(item["metadata"]["answer"]) for item in items],
+            items,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"유저 {len(users)}명, 자소서 {len(resumes)}개, 예시 {len(items)}개를 생성했습니다."
+            )
+        )
+
+    def _paragraph(self, rng, words):
+        return " ".join(
+            rng.choice(
+                KEYWORDS
+                + ["경험을", "통해", "배운", "점을", "바탕으로", "기여하겠습니다."]
+            )
+            for _ in range(words)
+        )
@@ -1,11 +1,141 @@
-from django.http import HttpResponse
+import time
+from abc import ABC, abstractmethod
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import FileResponse, HttpResponse
+
+from resumai.instrumentation import (
+    detach_request,
+    finish_request,
+    render_metrics,
+    start_request,
+    use_request_stats,
+)
+
+
+class AsyncCapableMiddleware(ABC):
+    # ASGI 모드에서 async view 앞의 middleware가 sync-only이면 Django가 요청마다 스레드를 거쳐 실행하므로
+    # sync / async 모두 지원하고, 다음 handler가 async이면 __acall__로 처리
+    sync_capable = True
+    async_capable = True
 
-class HealthCheckMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
 
     def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        return self.handle(request)
+
+    @abstractmethod
+    def handle(self, request):
+        """sync 요청 처리"""
+
+    @abstractmethod
+    async def __acall__(self, request):
+        """async 요청 처리"""
+
+
+class HealthCheckMiddleware(AsyncCapableMiddleware):
+    def handle(self, request):
         if request.path == "/health":
             return HttpResponse("ok")
         return self.get_response(request)
+
+    async def __acall__(self, request):
+        if request.path == "/health":
+            return HttpResponse("ok")
+        return await self.get_response(request)
+
+
+class InstrumentationMiddleware(AsyncCapableMiddleware):
+    # 요청별 구간 시간 / 토큰 사용량을 모아 로그와 metric으로 남기고, METRICS_PATH에서 metric을 노출
+    # 스트리밍 응답은 view가 응답 객체를 반환한 뒤에 생성이 진행되므로, body를 모두 보낸 뒤에 기록
+    def handle(self, request):
+        if request.path == settings.INSTRUMENTATION["METRICS_PATH"]:
+            return self.metrics(request)
+
+        token = start_request()
+        started = time.perf_counter()
+        response = self.get_response(request)
+        return self.finish(request, response, detach_request(token), started)
+
+    async def __acall__(self, request):
+        if request.path == settings.INSTRUMENTATION["METRICS_PATH"]:
+            return self.metrics(request)
+
+        token = start_request()
+        started = time.perf_counter()
+        response = await self.get_response(request)
+        return self.finish(request, response, detach_request(token), started)
+
+    def finish(self, request, response, stats, started):
+        route = request.resolver_match.route if request.resolver_match else "unmatched"
+
+        def done():
+            finish_request(
+                stats,
+                request.method,
+                route,
+                response.status_code,
+                time.perf_counter() - started,
+            )
+
+        if not response.streaming or isinstance(response, FileResponse):
+            done()
+        elif response.is_async:
+            response.streaming_content = _astream_with_stats(
+                response.streaming_content, stats, done
+            )
+        else:
+            response.streaming_content = _stream_with_stats(
+                response.streaming_content, stats, done
+            )
+        return response
+
+    def metrics(self, request):
+        # token 없이 metric(엔드포인트별 토큰 사용량 등)을 공개하지 않도록 METRICS_TOKEN이 없으면 DEBUG에서만 노출
+        metrics_token = settings.INSTRUMENTATION["METRICS_TOKEN"]
+        if not metrics_token and not settings.DEBUG:
+            return HttpResponse(status=404)
+        if (
+            metrics_token
+            and request.headers.get("Authorization") != f"Bearer {metrics_token}"
+        ):
+            return HttpResponse(status=403)
+        return HttpResponse(
+            render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+
+def _stream_with_stats(content, stats, done):
+    iterator = iter(content)
+    try:
+        while True:
+            with use_request_stats(stats):
+                try:
+                    chunk = next(iterator)
+                except StopIteration:
+                    return
+            yield chunk
+    finally:
+        # 클라이언트 연결이 끊겨 중간에 닫힌 경우에도 기록
+        done()
+
+
+async def _astream_with_stats(content, stats, done):
+    iterator = aiter(content)
+    try:
+        while True:
+            with use_request_stats(stats):
+                try:
+                    chunk = await anext(iterator)
+                except StopAsyncIteration:
+                    return
+            yield chunk
+    finally:
+        done()
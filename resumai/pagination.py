@@ -0,0 +1,76 @@
+from collections import OrderedDict
+
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+
+CURSOR_PAGINATION_PARAMETERS = [
+    OpenApiParameter(
+        name="pagination",
+        type=str,
+        enum=["cursor"],
+        description="`cursor`로 지정하면 page 번호 대신 cursor 기반으로 조회합니다. (응답의 `next`/`previous` 링크 사용)",
+    ),
+    OpenApiParameter(
+        name="cursor", type=str, description="이전 응답의 `next`/`previous`에 담긴 cursor 값입니다."
+    ),
+    OpenApiParameter(
+        name="count",
+        type=bool,
+        description="cursor 방식에서 전체 개수(`count`)를 함께 받으려면 true로 지정합니다. (기본값: 계산하지 않음)",
+    ),
+]
+
+
+class KeysetPagination(CursorPagination):
+    # 인덱스가 걸린 정렬 키 (updated_at, id) 기준의 keyset pagination
+    # OFFSET / COUNT(*) 없이 다음 페이지를 조회하므로 깊은 페이지도 첫 페이지와 비용이 같음
+    ordering = ("-updated_at", "-id")
+    page_size_query_param = "size"
+    max_page_size = 100
+    count_query_param = "count"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # 전체 개수는 ?count=true 로 요청한 경우에만 계산
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ("true", "1"):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        body = OrderedDict()
+        if self.count is not None:
+            body["count"] = self.count
+        body["next"] = self.get_next_link()
+        body["previous"] = self.get_previous_link()
+        body["results"] = data
+        return Response(body)
+
+
+class CursorOrPageNumberPagination(PageNumberPagination):
+    # ?pagination=cursor 또는 ?cursor= 가 있으면 keyset pagination, 아니면 기존 page 방식
+    cursor_ordering = KeysetPagination.ordering
+
+    def is_cursor_request(self, request):
+        return (
+            KeysetPagination.cursor_query_param in request.query_params
+            or request.query_params.get("pagination") == "cursor"
+        )
+
+    def get_cursor_paginator(self):
+        paginator = KeysetPagination()
+        paginator.ordering = self.cursor_ordering
+        paginator.page_size = self.page_size
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_paginator = None
+        if self.is_cursor_request(request):
+            self.cursor_paginator = self.get_cursor_paginator()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
@@ -0,0 +1,10 @@
+from rest_framework.renderers import JSONRenderer
+
+from resumai.instrumentation import span
+
+
+class TimedJSONRenderer(JSONRenderer):
+    # DRF 응답의 직렬화(JSON 렌더링) 시간을 "render" 구간으로 측정
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with span("render"):
+            return super().render(data, accepted_media_type, renderer_context)
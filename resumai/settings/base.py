@@ -51,6 +51,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     "resumai.middleware.HealthCheckMiddleware",
+    "resumai.middleware.InstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -75,7 +76,11 @@ ACCOUNT_EMAIL_VERIFICATION = "none"
 REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "accounts.authentication.CachedJWTAuthentication",
+    ),
+    "DEFAULT_RENDERER_CLASSES": (
+        "resumai.renderers.TimedJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
@@ -136,7 +141,29 @@ TEMPLATES = [
 
 
 WSGI_APPLICATION = "resumai.wsgi.application"
+ASGI_APPLICATION = "resumai.asgi.application"
+
+# ASGI(uvicorn worker)로 배포할 때 True로 설정하면 LLM 엔드포인트가 async view로 동작합니다.
+ASYNC_LLM_VIEWS = env.bool("ASYNC_LLM_VIEWS", default=False)
+
 
+# DB 커넥션 재사용 (dev.py / prod.py의 DATABASES에 적용)
+# - 기본(django.db.backends.mysql): CONN_MAX_AGE 동안 스레드별로 커넥션을 유지하고 재사용 전 health check
+#   ASGI 모드에서는 요청마다 스레드가 달라질 수 있어 persistent connection을 끄는 것이 기본값
+# - DATABASE_ENGINE=resumai.db.backends.mysql_pool: 프로세스 내 커넥션 풀 사용 (POOL_OPTIONS로 worker당 크기 조절)
+#   커넥션은 요청이 끝나면 풀에 반납되므로 backend에서 CONN_MAX_AGE를 0으로 고정 (DATABASE_CONN_MAX_AGE 무시)
+DATABASE_CONNECTION_OPTIONS = {
+    "CONN_MAX_AGE": env.int(
+        "DATABASE_CONN_MAX_AGE", default=0 if ASYNC_LLM_VIEWS else 60
+    ),
+    "CONN_HEALTH_CHECKS": True,
+    "POOL_OPTIONS": {
+        "POOL_SIZE": env.int("DATABASE_POOL_SIZE", default=5),
+        "MAX_OVERFLOW": env.int("DATABASE_POOL_MAX_OVERFLOW", default=10),
+        "RECYCLE": env.int("DATABASE_POOL_RECYCLE", default=3600),
+        "TIMEOUT": env.int("DATABASE_POOL_TIMEOUT", default=10),
+    },
+}
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -195,6 +222,158 @@ SPECTACULAR_SETTINGS = {
     },
 }
 
+# Cache
+# REDIS_URL이 설정되어 있으면 여러 worker가 공유하는 Redis cache를 사용합니다.
+REDIS_URL = env("REDIS_URL", default="")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+# 요청 구간 측정 / Prometheus metric (resumai/instrumentation.py)
+# METRICS_TOKEN을 설정하면 METRICS_PATH 요청에 "Authorization: Bearer <token>" 헤더가 필요하며,
+# 설정하지 않으면 DEBUG에서만 metric을 노출 (운영에서는 nginx가 모든 경로를 그대로 전달하므로)
+INSTRUMENTATION = {
+    "METRICS_PATH": "/metrics",
+    "METRICS_TOKEN": env("METRICS_TOKEN", default=""),
+}
+
+# 유저별 LLM 사용 횟수 제한 (accounts/quota.py)
+# 가이드라인 생성, 자소서 생성, 챗봇 대화마다 COSTS만큼 차감하며 매일 DAILY_LIMIT으로 초기화
+LLM_QUOTA = {
+    "ENABLED": env.bool("LLM_QUOTA_ENABLED", default=True),
+    "DAILY_LIMIT": env.int("LLM_QUOTA_DAILY_LIMIT", default=30),
+    "COSTS": {
+        "guideline": 1,
+        "generate": 1,
+        "chat": 1,
+    },
+}
+
+# 작업별 LLM 모델 (resume/llm_routes.py)
+# FALLBACK_MODEL: 응답 검증(가이드라인 형식, 챗봇 응답 길이 등)에 실패했을 때 다시 호출할 더 큰 모델
+# chat_edit: 요구사항이 MAX_QUERY_TOKENS 이하인 짧은 수정 요청은 chat 대신 이 경로로 처리
+# 큰 모델을 쓰는 경로의 기본값은 OPENAI_CHAT_MODEL(utils/openai_call.py의 CHAT_MODEL과 같은 값)
+OPENAI_CHAT_MODEL = env("OPENAI_CHAT_MODEL", default="gpt-4o")
+LLM_ROUTES = {
+    "guideline": {
+        "MODEL": env("LLM_GUIDELINE_MODEL", default="gpt-4o-mini"),
+        "FALLBACK_MODEL": env(
+            "LLM_GUIDELINE_FALLBACK_MODEL", default=OPENAI_CHAT_MODEL
+        ),
+    },
+    "generate": {
+        "MODEL": env("LLM_GENERATE_MODEL", default=OPENAI_CHAT_MODEL),
+        "FALLBACK_MODEL": "",
+    },
+    "chat": {
+        "MODEL": env("LLM_CHAT_MODEL", default=OPENAI_CHAT_MODEL),
+        "FALLBACK_MODEL": "",
+    },
+    "chat_edit": {
+        "MODEL": env("LLM_CHAT_EDIT_MODEL", default="gpt-4o-mini"),
+        "FALLBACK_MODEL": env(
+            "LLM_CHAT_EDIT_FALLBACK_MODEL", default=OPENAI_CHAT_MODEL
+        ),
+        "MAX_QUERY_TOKENS": env.int("LLM_CHAT_EDIT_MAX_QUERY_TOKENS", default=60),
+    },
+    "summary": {
+        "MODEL": env("LLM_SUMMARY_MODEL", default=OPENAI_CHAT_MODEL),
+        "FALLBACK_MODEL": "",
+    },
+    "repair": {
+        "MODEL": env("LLM_REPAIR_MODEL", default="gpt-4o-mini"),
+        "FALLBACK_MODEL": "",
+    },
+}
+
+# 카카오 OAuth / API 호출 (accounts/kakao.py)
+# 연속으로 FAILURE_THRESHOLD번 실패하면 RESET_TIMEOUT(초) 동안 카카오 호출 없이 바로 503을 반환
+KAKAO_CLIENT = {
+    "CONNECT_TIMEOUT": env.float("KAKAO_CONNECT_TIMEOUT", default=3.0),
+    "READ_TIMEOUT": env.float("KAKAO_READ_TIMEOUT", default=5.0),
+    "MAX_RETRIES": 2,
+    "RETRY_BACKOFF": 0.3,
+    "POOL_MAXSIZE": 10,
+    "FAILURE_THRESHOLD": 5,
+    "RESET_TIMEOUT": 30,
+}
+
+# JWT 인증 유저 캐시 (accounts/authentication.py)
+# 유저가 저장/삭제되면 바로 지워지지만, LocMemCache(REDIS_URL 미설정)에서는 다른 worker의 cache를
+# 지울 수 없으므로(비활성화한 유저가 TIMEOUT 동안 인증될 수 있음) 기본값으로 사용하지 않습니다.
+# TIMEOUT이 0이면 매 요청마다 DB에서 조회합니다.
+AUTH_USER_CACHE = {
+    "TIMEOUT": env.int(
+        "AUTH_USER_CACHE_TIMEOUT", default=60 * 5 if REDIS_URL else 0
+    ),
+    "CACHE_ALIAS": "default",
+}
+
+# 가이드라인 응답 캐시 (resume/guideline_cache.py)
+# BACKEND: memory(프로세스 내 LRU) | django(CACHES) | redis
+# SIMILARITY_THRESHOLD: 설정하면 정확히 일치하는 질문이 없을 때 임베딩 코사인 유사도가 이 값 이상인 질문의 가이드라인을 재사용
+GUIDELINE_CACHE = {
+    "BACKEND": env("GUIDELINE_CACHE_BACKEND", default="memory"),
+    "TIMEOUT": env.int("GUIDELINE_CACHE_TIMEOUT", default=60 * 60 * 24 * 7),
+    "MAX_ENTRIES": env.int("GUIDELINE_CACHE_MAX_ENTRIES", default=1000),
+    "SIMILARITY_THRESHOLD": env.float("GUIDELINE_CACHE_SIMILARITY_THRESHOLD", default=None),
+    "CACHE_ALIAS": "default",
+    "REDIS_URL": REDIS_URL,
+}
+
+# 자소서 예시 retriever (resume/retrievers.py)
+# BACKEND: pinecone | local (manage.py build_local_index로 만든 NumPy index를 사용)
+# ENABLED가 false이거나 검색이 DEADLINE(초) 안에 끝나지 않으면 예시 없는 프롬프트로 생성
+RETRIEVER = {
+    "ENABLED": env.bool("RETRIEVER_ENABLED", default=True),
+    "DEADLINE": env.float("RETRIEVER_DEADLINE", default=1.5),
+    "MAX_WORKERS": env.int("RETRIEVER_MAX_WORKERS", default=8),
+    "BACKEND": env("RETRIEVER_BACKEND", default="pinecone"),
+    "TOP_K": env.int("RETRIEVER_TOP_K", default=2),
+    "PINECONE_INDEX_NAME": "resumai-self-introduction-index",
+    "LOCAL_INDEX_DIR": env(
+        "RETRIEVER_LOCAL_INDEX_DIR", default=os.path.join(BASE_DIR, "data", "retriever")
+    ),
+    "LOCAL_ANN": env.bool("RETRIEVER_LOCAL_ANN", default=False),
+    # 프롬프트에 넣는 예시의 토큰 수 제한 (전체 / 예시 답변 하나)
+    "EXAMPLE_TOKEN_BUDGET": env.int("RETRIEVER_EXAMPLE_TOKEN_BUDGET", default=1500),
+    "EXAMPLE_MAX_TOKENS": env.int("RETRIEVER_EXAMPLE_MAX_TOKENS", default=600),
+}
+
+# 백그라운드 생성 작업 (resume/jobs.py, manage.py run_generation_worker)
+GENERATION_JOBS = {
+    "MAX_ACTIVE_PER_USER": env.int("GENERATION_JOBS_MAX_ACTIVE_PER_USER", default=2),
+    "MAX_ATTEMPTS": env.int("GENERATION_JOBS_MAX_ATTEMPTS", default=3),
+    "RETRY_BACKOFF": 5,  # 초, 재시도마다 2배씩 증가
+    "RETRY_BACKOFF_MAX": 60,
+    "STALE_AFTER": 600,  # RUNNING 상태로 이 시간(초)이 지나면 worker가 죽은 것으로 보고 다시 실행
+    "WORKER_CONCURRENCY": env.int("GENERATION_JOBS_WORKER_CONCURRENCY", default=4),
+    "POLL_INTERVAL": 1.0,
+}
+
+# 메모 검색 (memos/search.py)
+# BACKEND: auto(MySQL이면 FULLTEXT ngram 인덱스, 그 외에는 icontains) | fulltext | icontains
+MEMO_SEARCH = {
+    "BACKEND": env("MEMO_SEARCH_BACKEND", default="auto"),
+}
+
+# 채팅 메모리 (resume/memory.py)
+# 최근 대화는 TOKEN_BUDGET 안에서 그대로 프롬프트에 넣고, 넘치는 대화는 Resume.chat_summary에 요약
+CHAT_MEMORY = {
+    "TOKEN_BUDGET": env.int("CHAT_MEMORY_TOKEN_BUDGET", default=3000),
+    "TOKENIZER_MODEL": "gpt-4o",
+}
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
@@ -204,4 +383,18 @@ SITE_ID = 1
 LOGGING = {
     "version": 1,  # the dictConfig format version
     "disable_existing_loggers": False,  # retain the default loggers
+    "formatters": {
+        "default": {"format": "%(asctime)s %(levelname)s %(name)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "default"},
+    },
+    "loggers": {
+        # 요청별 처리 시간 / 구간 / 토큰 사용량 (JSON, resumai/instrumentation.py)
+        "resumai.request": {
+            "handlers": ["console"],
+            "level": env("REQUEST_LOG_LEVEL", default="INFO"),
+            "propagate": False,
+        },
+    },
 }
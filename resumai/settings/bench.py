@@ -0,0 +1,56 @@
+# 오프라인 벤치마크를 위한 세팅입니다. (resumai/benchmark.py)
+# 1. python manage.py run_fake_openai --settings=resumai.settings.bench
+# 2. python manage.py migrate / seed_benchmark_data --settings=resumai.settings.bench
+# 3. DJANGO_SETTINGS_MODULE=resumai.settings.bench gunicorn resumai.wsgi -w 4 --threads 8
+# 4. python manage.py run_benchmark --settings=resumai.settings.bench --concurrency 20
+import os
+
+# 외부 서비스 키가 없어도 실행되도록 기본값을 채움 (OpenAI 호출은 fake 서버로 보냄)
+os.environ.setdefault("DJANGO_SECURE_KEY", "bench-secret-key-not-for-production-use")
+os.environ.setdefault("BASE_URL", "http://127.0.0.1:8000/")
+os.environ.setdefault("KAKAO_REST_API_KEY", "bench")
+os.environ.setdefault("KAKAO_CLIENT_SECRET_KEY", "bench")
+os.environ.setdefault("OPENAI_API_KEY", "bench")
+os.environ.setdefault("OPENAI_BASE_URL", "http://127.0.0.1:8089/v1")
+os.environ.setdefault("PINECONE_API_KEY", "bench")
+# 동시 요청이 하나의 upstream 호출로 합쳐지거나 이전 실행의 임베딩 캐시를 재사용하면
+# 실제 부하보다 처리량이 높게 측정되므로 끔 (합치기 / 캐시 효과를 측정할 때만 켬)
+os.environ.setdefault("LLM_SINGLE_FLIGHT", "false")
+os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+
+from .base import *  # noqa
+
+BENCH_DATA_DIR = os.path.join(BASE_DIR, "data", "bench")
+os.makedirs(BENCH_DATA_DIR, exist_ok=True)
+
+# DATABASE_NAME이 설정되어 있으면 dev와 같은 MySQL을, 아니면 sqlite 파일을 사용
+if env("DATABASE_NAME", default=""):
+    DATABASES = {
+        "default": {
+            "ENGINE": env("DATABASE_ENGINE", default="django.db.backends.mysql"),
+            "NAME": env("DATABASE_NAME"),
+            "USER": env("DATABASE_USER"),
+            "PASSWORD": env("DATABASE_PASSWORD"),
+            "HOST": env("DATABASE_HOST"),
+            "PORT": env("DATABASE_PORT"),
+            **DATABASE_CONNECTION_OPTIONS,
+        }
+    }
+else:
+    DATABASES = {
+        "default": {
+            "ENGINE": "django.db.backends.sqlite3",
+            "NAME": os.path.join(BENCH_DATA_DIR, "db.sqlite3"),
+            "OPTIONS": {"timeout": 30},
+        }
+    }
+
+RETRIEVER = {
+    **RETRIEVER,
+    "BACKEND": "local",
+    "LOCAL_INDEX_DIR": os.path.join(BENCH_DATA_DIR, "retriever"),
+}
+
+LLM_QUOTA = {**LLM_QUOTA, "ENABLED": False}
+
+DEBUG = False
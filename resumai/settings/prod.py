@@ -9,12 +9,13 @@ environ.Env.read_env(os.path.join(BASE_DIR, ".env.prod"))
 
 DATABASES = {
     "default": {
-        "ENGINE": "django.db.backends.mysql",
+        "ENGINE": env("DATABASE_ENGINE", default="django.db.backends.mysql"),
         "NAME": env("DATABASE_NAME"),
         "USER": env("DATABASE_USER"),
         "PASSWORD": env("DATABASE_PASSWORD"),
         "HOST": env("DATABASE_HOST"),
         "PORT": env("DATABASE_PORT"),
+        **DATABASE_CONNECTION_OPTIONS,
     }
 }
 
@@ -0,0 +1,206 @@
+# ASGI 모드(settings.ASYNC_LLM_VIEWS)에서 사용하는 LLM 엔드포인트의 async 버전입니다.
+# OpenAI/Pinecone 호출을 기다리는 동안 worker를 점유하지 않으므로, 하나의 프로세스에서
+# 여러 생성 요청을 동시에 처리할 수 있습니다. URL과 요청/응답 형식은 sync 버전과 동일합니다.
+from adrf.views import APIView
+from asgiref.sync import sync_to_async
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from rest_framework import serializers, status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from drf_spectacular.utils import (
+    extend_schema,
+    inline_serializer,
+    OpenApiParameter,
+)
+
+from accounts.quota import (
+    QuotaExceeded,
+    aconsume_quota,
+    allm_quota,
+    arefund_quota,
+)
+from resume.guideline_cache import get_guideline_cache
+from resume.llm_routes import acomplete, route_model
+from resume.memory import build_chat_memory
+from resume.models import Resume, ChatHistory
+from resume.serializers import GenerateResumeSerializer, GuidelineSerializer
+from resume.services import (
+    abuild_generate_prompt,
+    agenerate_guidelines,
+    asave_generated_resume,
+    arespond_to_chat,
+)
+from resume.views import _quota_exceeded_response, _sse
+from utils.openai_call import astream_chat_openai
+
+
+class AsyncGetGuidelinesView(APIView):
+    permission_classes = [IsAuthenticated]
+    serializer_class = GuidelineSerializer
+
+    @extend_schema(
+        summary="가이드라인 생성",
+        description="질문을 기반으로 가이드라인을 생성합니다.",
+        parameters=[
+            OpenApiParameter(
+                name="question",
+                type=str,
+                description="기업이 제시한 질문을 입력합니다.",
+            )
+        ],
+    )
+    async def get(self, request):
+        question = request.GET.get("question")
+
+        # 캐시 backend(redis 등)와 유사도 검색용 임베딩 호출은 동기 코드이므로 스레드에서 실행
+        guideline_cache = get_guideline_cache()
+        cached_guideline_list = await sync_to_async(
+            guideline_cache.get, thread_sensitive=False
+        )(question)
+        if cached_guideline_list is not None:
+            return JsonResponse({"result": cached_guideline_list})
+
+        try:
+            async with allm_quota(request.user, "guideline"):
+                guideline_list = await agenerate_guidelines(question)
+            await sync_to_async(guideline_cache.set, thread_sensitive=False)(
+                question, guideline_list
+            )
+            guideline_json = {"result": guideline_list}
+            return JsonResponse(guideline_json)
+        except QuotaExceeded:
+            return _quota_exceeded_response()
+        except Exception as e:
+            error_message = {
+                "error": "가이드라인 생성 중 오류가 발생했습니다. 질문을 올바르게 입력해 주세요."
+            }
+            return JsonResponse(error_message, status=500)
+
+
+class AsyncGenerateResumeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="자소서 생성",
+        description="답변을 기반으로 자기소개서를 생성합니다.",
+        responses={
+            201: inline_serializer(
+                name="AsyncCreateResumeResponse",
+                fields={"id": serializers.IntegerField(help_text="생성된 자소서의 ID")},
+            )
+        },
+        request=GenerateResumeSerializer,
+    )
+    async def post(self, request):
+        try:
+            async with allm_quota(request.user, "generate"):
+                prompt = await abuild_generate_prompt(request.data)
+                generated_self_introduction = await acomplete("generate", prompt)
+        except QuotaExceeded:
+            return _quota_exceeded_response()
+
+        saved_instance, errors = await asave_generated_resume(
+            request.user, request.data, prompt, generated_self_introduction
+        )
+        if errors is not None:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        return Response({"id": saved_instance.id}, status=status.HTTP_201_CREATED)
+
+
+class AsyncGenerateResumeStreamView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="자소서 생성 (스트리밍)",
+        description="답변을 기반으로 자기소개서를 생성하고, 생성되는 토큰을 Server-Sent Events로 전달합니다.",
+        request=GenerateResumeSerializer,
+        responses={200: {"type": "string", "format": "text/event-stream"}},
+    )
+    async def post(self, request):
+        user = request.user
+        data = request.data
+
+        try:
+            await aconsume_quota(user, "generate")
+        except QuotaExceeded:
+            return _quota_exceeded_response()
+        try:
+            prompt = await abuild_generate_prompt(data)
+        except Exception:
+            await arefund_quota(user, "generate")
+            raise
+
+        async def event_stream():
+            tokens = astream_chat_openai(prompt, model=route_model("generate"))
+            chunks = []
+            try:
+                async for token in tokens:
+                    chunks.append(token)
+                    yield _sse("token", {"content": token})
+            except Exception:
+                await arefund_quota(user, "generate")
+                yield _sse("error", {"error": "자기소개서 생성 중 오류가 발생했습니다."})
+                return
+            finally:
+                # 클라이언트 연결이 끊기면 Django가 응답 task를 취소하므로 여기서 upstream 응답을 닫음
+                await tokens.aclose()
+
+            saved_instance, errors = await asave_generated_resume(
+                user, data, prompt, "".join(chunks)
+            )
+            if errors is not None:
+                yield _sse("error", {"error": errors})
+                return
+            yield _sse("done", {"id": saved_instance.id})
+
+        response = StreamingHttpResponse(
+            event_stream(), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
+
+
+class AsyncChatView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="챗봇 대화",
+        description="챗봇과의 대화를 통해 자기소개서를 첨삭 받습니다..",
+        responses={200: {"answer": "string"}},
+        request={
+            "application/json": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string"},
+                },
+            },
+        },
+    )
+    async def post(self, request, id):
+        user = request.user
+        query = request.data.get("query", "")
+
+        try:
+            resume = await Resume.objects.aget(pk=id)
+        except Resume.DoesNotExist:
+            raise Http404
+
+        try:
+            async with allm_quota(user, "chat"):
+                # 오래된 대화는 요약으로, 최근 대화는 토큰 예산 안에서 그대로 프롬프트에 포함
+                memory = await sync_to_async(build_chat_memory)(resume)
+
+                # 챗봇으로부터 응답을 받음
+                chatbot_response = await arespond_to_chat(query, memory)
+        except QuotaExceeded:
+            return _quota_exceeded_response()
+
+        # 새로운 대화 기록을 생성하고 저장
+        await ChatHistory.objects.acreate(
+            resume=resume, query=query, response=chatbot_response
+        )
+
+        return JsonResponse({"answer": chatbot_response}, status=status.HTTP_200_OK)
@@ -0,0 +1,193 @@
+# 가이드라인 응답 캐시
+# 사용자들이 묻는 질문("지원 동기", "성장 과정" 등)은 대부분 반복되므로, 정규화한 질문 문자열을 key로
+# 생성된 가이드라인을 저장해 두고 같은 질문에는 LLM 호출 없이 바로 응답합니다.
+# 정확히 일치하는 질문이 없으면 (설정된 경우) 임베딩 유사도로 비슷한 질문의 가이드라인을 재사용합니다.
+import hashlib
+import json
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+KEY_PREFIX = "guideline:"
+
+_PUNCTUATION_RE = re.compile(r"[\s\"'`‘’“”.,!?·~:;()\[\]{}<>]+")
+
+
+def normalize_question(question):
+    # "지원 동기", "'지원동기'", "지원동기?" 를 모두 같은 key로 취급
+    question = unicodedata.normalize("NFKC", question or "")
+    return _PUNCTUATION_RE.sub("", question).lower()
+
+
+class LocMemBackend:
+    # 프로세스 내 LRU + TTL 캐시
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self._lock:
+            self._data[key] = (time.monotonic() + timeout, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+
+class DjangoCacheBackend:
+    # settings.CACHES에 설정된 Django cache 사용 (eviction은 해당 cache backend가 담당)
+    def __init__(self, alias):
+        from django.core.cache import caches
+
+        self.cache = caches[alias]
+
+    def get(self, key):
+        return self.cache.get(key)
+
+    def set(self, key, value, timeout):
+        self.cache.set(key, value, timeout)
+
+
+class RedisBackend:
+    def __init__(self, url):
+        try:
+            import redis
+        except ImportError:
+            raise ImproperlyConfigured(
+                "GUIDELINE_CACHE BACKEND 'redis'를 사용하려면 redis 패키지가 필요합니다."
+            )
+        if not url:
+            raise ImproperlyConfigured("GUIDELINE_CACHE REDIS_URL이 설정되지 않았습니다.")
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key):
+        value = self.client.get(key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    def set(self, key, value, timeout):
+        self.client.set(key, json.dumps(value, ensure_ascii=False), ex=timeout)
+
+
+class GuidelineCache:
+    def __init__(self, backend, timeout, max_entries, similarity_threshold=None):
+        self.backend = backend
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        # 유사도 검색용: 정규화된 질문 -> 단위 벡터 (프로세스 내에서만 유지)
+        self._embeddings = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _key(self, normalized):
+        return KEY_PREFIX + hashlib.sha256(normalized.encode()).hexdigest()
+
+    def get(self, question):
+        normalized = normalize_question(question)
+        if not normalized:
+            return None
+
+        guidelines = self.backend.get(self._key(normalized))
+        if guidelines is not None or self.similarity_threshold is None:
+            return guidelines
+
+        similar = self._find_similar(normalized)
+        if similar is None:
+            return None
+        return self.backend.get(self._key(similar))
+
+    def set(self, question, guidelines):
+        normalized = normalize_question(question)
+        if not normalized:
+            return
+        self.backend.set(self._key(normalized), guidelines, self.timeout)
+
+        if self.similarity_threshold is not None:
+            self._remember_embedding(normalized)
+
+    def _embed(self, normalized):
+        from utils.openai_call import get_embedding
+
+        vector = np.asarray(get_embedding(normalized), dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+
+    def _find_similar(self, normalized):
+        with self._lock:
+            if not self._embeddings:
+                return None
+            keys = list(self._embeddings.keys())
+            matrix = np.stack(list(self._embeddings.values()))
+
+        try:
+            query = self._embed(normalized)
+        except Exception:
+            return None
+
+        scores = matrix @ query
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity_threshold:
+            return None
+        return keys[best]
+
+    def _remember_embedding(self, normalized):
+        with self._lock:
+            if normalized in self._embeddings:
+                self._embeddings.move_to_end(normalized)
+                return
+        try:
+            vector = self._embed(normalized)
+        except Exception:
+            return
+        with self._lock:
+            self._embeddings[normalized] = vector
+            while len(self._embeddings) > self.max_entries:
+                self._embeddings.popitem(last=False)
+
+
+def _build_backend(config):
+    backend = config.get("BACKEND", "memory")
+    if backend == "memory":
+        return LocMemBackend(config.get("MAX_ENTRIES", 1000))
+    if backend == "django":
+        return DjangoCacheBackend(config.get("CACHE_ALIAS", "default"))
+    if backend == "redis":
+        return RedisBackend(config.get("REDIS_URL"))
+    raise ImproperlyConfigured(f"지원하지 않는 GUIDELINE_CACHE BACKEND입니다: {backend}")
+
+
+_guideline_cache = None
+_guideline_cache_lock = threading.Lock()
+
+
+def get_guideline_cache():
+    global _guideline_cache
+    if _guideline_cache is None:
+        with _guideline_cache_lock:
+            if _guideline_cache is None:
+                config = getattr(settings, "GUIDELINE_CACHE", {})
+                _guideline_cache = GuidelineCache(
+                    backend=_build_backend(config),
+                    timeout=config.get("TIMEOUT", 60 * 60 * 24),
+                    max_entries=config.get("MAX_ENTRIES", 1000),
+                    similarity_threshold=config.get("SIMILARITY_THRESHOLD"),
+                )
+    return _guideline_cache
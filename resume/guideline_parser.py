@@ -0,0 +1,95 @@
+# 가이드라인 응답 파싱
+# JSON mode로 {"guidelines": [...]} 형태를 요청하지만, 코드 블록(```json)이나 앞뒤 설명, 작은따옴표 list 등
+# 형식이 조금 어긋난 응답도 로컬에서 최대한 복구하여 LLM을 다시 호출하지 않도록 합니다.
+# 로컬 파싱에 실패한 경우에만 작은 모델로 형식만 고치는 repair 호출을 한 번 합니다. (resume/services.py)
+import ast
+import json
+import re
+
+from resume.llm_routes import OutputValidationError
+
+GUIDELINE_COUNT = 3
+
+_CODE_FENCE_RE = re.compile(r"```(?:json|python)?\s*(.*?)```", re.DOTALL)
+_LIST_RE = re.compile(r"\[.*\]", re.DOTALL)
+_QUOTED_RE = re.compile(
+    r"\"((?:[^\"\\]|\\.)+)\"|'((?:[^'\\]|\\.)+)'|‘([^’]+)’|“([^”]+)”"
+)
+_SEPARATOR_RE = re.compile(r"[\"'’”]\s*,\s*[\"'‘“]")
+_BULLET_RE = re.compile(r"^\s*(?:[-*•]|\d+[.)])\s+(.+?)\s*$", re.MULTILINE)
+
+
+class GuidelineParseError(OutputValidationError):
+    pass
+
+
+def _load(text):
+    # JSON → Python literal 순서로 시도
+    for loader in (json.loads, ast.literal_eval):
+        try:
+            return loader(text)
+        # literal_eval은 {[1]: 2}처럼 hash할 수 없는 key에 TypeError, 매우 긴 입력에 MemoryError를 발생시킴
+        except (ValueError, TypeError, SyntaxError, RecursionError, MemoryError):
+            continue
+    return None
+
+
+def _as_list(value):
+    if isinstance(value, dict):
+        # {"guidelines": [...]} 이외의 key를 사용한 경우 첫 번째 list 값을 사용
+        value = value.get("guidelines") or next(
+            (item for item in value.values() if isinstance(item, list)), None
+        )
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return None
+
+
+def _candidates(text):
+    text = text.strip()
+    fenced = _CODE_FENCE_RE.search(text)
+    if fenced:
+        text = fenced.group(1).strip()
+    yield _as_list(_load(text))
+
+    # 앞뒤에 설명이 붙은 경우 list 부분만 파싱
+    bracketed = _LIST_RE.search(text)
+    if bracketed:
+        yield _as_list(_load(bracketed.group(0)))
+        # 문장 안의 따옴표(예: '회사의 'core value'를 ...') 때문에 literal로 읽을 수 없으면
+        # 항목 사이의 구분자(', ')로 나눔
+        inner = bracketed.group(0)[1:-1].strip()
+        yield [part.strip("\"'‘’“” ") for part in _SEPARATOR_RE.split(inner)]
+        # 따옴표로 감싼 문자열만 추출
+        yield [
+            next(group for group in match if group)
+            for match in _QUOTED_RE.findall(bracketed.group(0))
+        ]
+
+    # list가 아니라 "- ..." / "1. ..." 목록으로 답한 경우
+    yield _BULLET_RE.findall(text)
+
+
+def validate_guidelines(items):
+    if not isinstance(items, list):
+        raise GuidelineParseError("가이드라인이 list 형식이 아닙니다.")
+    guidelines = [
+        item.strip() for item in items if isinstance(item, str) and item.strip()
+    ]
+    if len(guidelines) != GUIDELINE_COUNT:
+        raise GuidelineParseError(
+            f"가이드라인은 {GUIDELINE_COUNT}개여야 합니다. (응답: {len(guidelines)}개)"
+        )
+    return guidelines
+
+
+def parse_guidelines(text):
+    """모델 응답에서 가이드라인 3개를 추출합니다. 형식을 복구할 수 없으면 GuidelineParseError를 발생시킵니다."""
+    for items in _candidates(text or ""):
+        if not items:
+            continue
+        try:
+            return validate_guidelines(items)
+        except GuidelineParseError:
+            continue
+    raise GuidelineParseError(f"가이드라인 응답을 해석할 수 없습니다: {text!r:.200}")
@@ -0,0 +1,177 @@
+# DB 기반 백그라운드 작업 큐
+# 웹 요청은 GenerationJob을 저장하고 바로 job id를 반환하며,
+# `manage.py run_generation_worker` 프로세스가 작업을 가져가 LLM 호출을 수행합니다.
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import close_old_connections, transaction
+from django.utils import timezone
+
+from accounts.quota import refund_quota
+from resume.models import GenerationJob, Resume
+from resume.services import GenerationError, chat_with_resume, generate_resume
+
+logger = logging.getLogger(__name__)
+
+
+def retryable_errors():
+    # 일시적인 OpenAI 오류는 backoff 후 재시도
+    # (openai SDK는 worker에서 실제로 작업을 실행할 때 로드)
+    import openai
+
+    return (
+        openai.APIConnectionError,
+        openai.APITimeoutError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )
+
+
+ACTIVE_STATUSES = (GenerationJob.Status.PENDING, GenerationJob.Status.RUNNING)
+
+
+class JobLimitExceeded(Exception):
+    pass
+
+
+def submit_job(user, kind, payload, resume=None):
+    config = settings.GENERATION_JOBS
+    with transaction.atomic():
+        # 같은 유저의 동시 제출이 개수 제한을 함께 통과하지 않도록 유저 row를 잠금
+        get_user_model().objects.select_for_update().only("pk").get(pk=user.pk)
+        active_count = GenerationJob.objects.filter(
+            user=user, status__in=ACTIVE_STATUSES
+        ).count()
+        if active_count >= config["MAX_ACTIVE_PER_USER"]:
+            raise JobLimitExceeded
+
+        return GenerationJob.objects.create(
+            user=user,
+            resume=resume,
+            kind=kind,
+            payload=payload,
+            run_after=timezone.now(),
+        )
+
+
+def _fail_stale_job(job, now):
+    # 다른 worker가 먼저 처리한 경우 사용 횟수를 두 번 돌려주지 않도록 상태를 조건으로 갱신
+    updated = GenerationJob.objects.filter(
+        pk=job.pk, status=GenerationJob.Status.RUNNING
+    ).update(
+        status=GenerationJob.Status.FAILED,
+        error="작업 실행 중 worker가 응답하지 않아 재시도 횟수를 초과했습니다.",
+        updated_at=now,
+    )
+    if updated:
+        logger.error("job %s 실행 중 worker 종료, 재시도 횟수 초과", job.pk)
+        refund_quota(get_user_model()(pk=job.user_id), job.kind)
+
+
+def claim_next_job():
+    config = settings.GENERATION_JOBS
+    now = timezone.now()
+    with transaction.atomic():
+        # 실행 중 worker가 죽어 RUNNING으로 남은 작업은 다시 대기 상태로 돌림
+        # (작업이 worker를 계속 죽이는 경우 무한히 재시도하지 않도록 MAX_ATTEMPTS번 실행한 작업은 실패 처리)
+        stale_jobs = GenerationJob.objects.filter(
+            status=GenerationJob.Status.RUNNING,
+            started_at__lt=now - timedelta(seconds=config["STALE_AFTER"]),
+        )
+        for job in stale_jobs.filter(attempts__gte=config["MAX_ATTEMPTS"]).only(
+            "pk", "user_id", "kind"
+        ):
+            _fail_stale_job(job, now)
+        stale_jobs.update(status=GenerationJob.Status.PENDING, run_after=now)
+
+        job = (
+            GenerationJob.objects.select_for_update(skip_locked=True)
+            .filter(status=GenerationJob.Status.PENDING, run_after__lte=now)
+            .order_by("run_after", "id")
+            .first()
+        )
+        if job is None:
+            return None
+
+        job.status = GenerationJob.Status.RUNNING
+        job.attempts += 1
+        job.started_at = now
+        job.save(update_fields=["status", "attempts", "started_at", "updated_at"])
+        return job
+
+
+def _run(job):
+    if job.kind == GenerationJob.Kind.GENERATE:
+        resume = generate_resume(job.user, job.payload)
+        job.resume = resume
+        return {"id": resume.id}
+
+    if job.kind == GenerationJob.Kind.CHAT:
+        resume = Resume.objects.get(pk=job.resume_id)
+        chatbot_response = chat_with_resume(resume, job.payload.get("query", ""))
+        return {"answer": chatbot_response}
+
+    raise GenerationError(f"알 수 없는 작업 종류입니다: {job.kind}")
+
+
+def execute_job(job):
+    config = settings.GENERATION_JOBS
+    try:
+        job.result = _run(job)
+    except retryable_errors() as e:
+        job.error = str(e)
+        if job.attempts < config["MAX_ATTEMPTS"]:
+            delay = min(
+                config["RETRY_BACKOFF"] * 2 ** (job.attempts - 1),
+                config["RETRY_BACKOFF_MAX"],
+            )
+            job.status = GenerationJob.Status.PENDING
+            job.run_after = timezone.now() + timedelta(seconds=delay)
+            logger.warning("job %s 실패, %s초 후 재시도: %s", job.pk, delay, e)
+        else:
+            job.status = GenerationJob.Status.FAILED
+            logger.error("job %s 재시도 횟수 초과: %s", job.pk, e)
+    except Exception as e:
+        job.status = GenerationJob.Status.FAILED
+        job.error = str(e)
+        logger.exception("job %s 실패", job.pk)
+    else:
+        job.status = GenerationJob.Status.SUCCEEDED
+        job.error = ""
+
+    if job.status == GenerationJob.Status.FAILED:
+        # 작업 등록 시 차감한 LLM 사용 횟수를 돌려줌
+        refund_quota(job.user, job.kind)
+
+    job.save(
+        update_fields=["status", "result", "error", "run_after", "resume", "updated_at"]
+    )
+    return job
+
+
+def run_worker(poll_interval, stop_event):
+    failures = 0
+    while not stop_event.is_set():
+        close_old_connections()
+        try:
+            job = claim_next_job()
+            if job is not None:
+                execute_job(job)
+        except Exception:
+            # DB 연결이 끊기는 등의 오류로 worker 스레드가 종료되지 않도록 기록하고 잠시 후 다시 시도
+            # (실행 중이던 작업은 STALE_AFTER가 지나면 다시 대기 상태가 됨)
+            failures += 1
+            delay = min(
+                poll_interval * 2**failures,
+                settings.GENERATION_JOBS["RETRY_BACKOFF_MAX"],
+            )
+            logger.exception("작업 처리 중 오류, %s초 후 다시 시도", delay)
+            close_old_connections()
+            stop_event.wait(delay)
+            continue
+
+        failures = 0
+        if job is None:
+            stop_event.wait(poll_interval)
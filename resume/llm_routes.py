@@ -0,0 +1,68 @@
+# 작업별 LLM 모델 선택
+# settings.LLM_ROUTES에서 작업(guideline, generate, chat, chat_edit, summary, repair)마다 모델을 정하므로
+# 짧은 가이드라인이나 간단한 수정 요청은 작은 모델로 빠르고 저렴하게 처리할 수 있습니다.
+# validate가 OutputValidationError를 발생시키면 FALLBACK_MODEL(더 큰 모델)로 한 번 더 호출합니다.
+import inspect
+import logging
+
+from django.conf import settings
+
+from resumai.instrumentation import LLM_FALLBACK
+from utils.openai_call import aget_chat_openai, get_chat_openai
+
+logger = logging.getLogger(__name__)
+
+
+class OutputValidationError(ValueError):
+    pass
+
+
+def route_model(task):
+    return settings.LLM_ROUTES[task]["MODEL"]
+
+
+def _fallback_model(task, error):
+    fallback_model = settings.LLM_ROUTES[task].get("FALLBACK_MODEL")
+    if not fallback_model:
+        return None
+    logger.warning(
+        "%s 응답 검증 실패, %s 모델로 다시 호출: %s", task, fallback_model, error
+    )
+    LLM_FALLBACK.inc(task=task, model=fallback_model)
+    return fallback_model
+
+
+def complete(task, prompt, validate=None, **kwargs):
+    """task에 지정된 모델로 호출합니다. validate가 주어지면 검증(변환)한 결과를 반환합니다."""
+    output = get_chat_openai(prompt, model=route_model(task), **kwargs)
+    if validate is None:
+        return output
+    try:
+        return validate(output)
+    except OutputValidationError as e:
+        fallback_model = _fallback_model(task, e)
+        if fallback_model is None:
+            raise
+    return validate(get_chat_openai(prompt, model=fallback_model, **kwargs))
+
+
+async def _avalidate(validate, output):
+    # validate는 동기 함수 또는 coroutine 함수 (가이드라인 repair처럼 LLM을 다시 호출하는 경우)
+    result = validate(output)
+    if inspect.isawaitable(result):
+        result = await result
+    return result
+
+
+async def acomplete(task, prompt, validate=None, **kwargs):
+    output = await aget_chat_openai(prompt, model=route_model(task), **kwargs)
+    if validate is None:
+        return output
+    try:
+        return await _avalidate(validate, output)
+    except OutputValidationError as e:
+        fallback_model = _fallback_model(task, e)
+        if fallback_model is None:
+            raise
+    output = await aget_chat_openai(prompt, model=fallback_model, **kwargs)
+    return await _avalidate(validate, output)
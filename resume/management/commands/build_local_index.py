@@ -0,0 +1,86 @@
+import json
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from resume.retrievers import write_local_index
+
+
+class Command(BaseCommand):
+    help = "local retriever(RETRIEVER BACKEND=local)에서 사용할 자소서 예시 index를 생성합니다."
+
+    def add_arguments(self, parser):
+        source = parser.add_mutually_exclusive_group(required=True)
+        source.add_argument(
+            "--from-pinecone",
+            action="store_true",
+            help="현재 Pinecone index의 벡터와 metadata를 그대로 내려받습니다.",
+        )
+        source.add_argument(
+            "--input",
+            help='{"question": ..., "answer": ...} 형식의 JSONL 파일을 임베딩합니다.',
+        )
+        parser.add_argument(
+            "--text-field",
+            default="answer",
+            help="--input 사용 시 임베딩할 필드 (기본값: answer)",
+        )
+        parser.add_argument(
+            "--output-dir",
+            default=settings.RETRIEVER["LOCAL_INDEX_DIR"],
+            help="index를 저장할 디렉토리",
+        )
+
+    def handle(self, *args, **options):
+        if options["from_pinecone"]:
+            embeddings, items = self._load_from_pinecone()
+        else:
+            embeddings, items = self._load_from_jsonl(
+                options["input"], options["text_field"]
+            )
+
+        if not items:
+            raise CommandError("index에 저장할 예시가 없습니다.")
+
+        write_local_index(options["output_dir"], embeddings, items)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{len(items)}개의 예시로 local index를 생성했습니다: {options['output_dir']}"
+            )
+        )
+
+    def _load_from_pinecone(self):
+        from pinecone import Pinecone
+
+        index = Pinecone().Index(settings.RETRIEVER["PINECONE_INDEX_NAME"])
+        embeddings, items = [], []
+        for ids in index.list():
+            for start in range(0, len(ids), 100):
+                fetched = index.fetch(ids=ids[start : start + 100])
+                for vector_id, vector in fetched["vectors"].items():
+                    embeddings.append(vector["values"])
+                    items.append(
+                        {"id": vector_id, "metadata": dict(vector.get("metadata") or {})}
+                    )
+        return embeddings, items
+
+    def _load_from_jsonl(self, path, text_field):
+        from utils.openai_call import get_embeddings
+
+        items = []
+        with open(path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                example = json.loads(line)
+                if text_field not in example:
+                    raise CommandError(f"{line_number}번째 줄에 '{text_field}' 필드가 없습니다.")
+                items.append(
+                    {
+                        "id": str(example.pop("id", line_number)),
+                        "metadata": example,
+                    }
+                )
+
+        embeddings = get_embeddings([item["metadata"][text_field] for item in items])
+        return embeddings, items
@@ -0,0 +1,50 @@
+import signal
+import threading
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from resume.jobs import run_worker
+
+
+class Command(BaseCommand):
+    help = "자소서 생성 / 챗봇 대화 백그라운드 작업(GenerationJob)을 처리하는 worker를 실행합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=settings.GENERATION_JOBS["WORKER_CONCURRENCY"],
+            help="동시에 처리할 작업 수 (스레드 수)",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=settings.GENERATION_JOBS["POLL_INTERVAL"],
+            help="대기 중인 작업이 없을 때 다시 확인하기까지의 시간(초)",
+        )
+
+    def handle(self, *args, **options):
+        stop_event = threading.Event()
+
+        def stop(signum, frame):
+            # 처리 중인 작업은 마치고 종료
+            stop_event.set()
+
+        signal.signal(signal.SIGTERM, stop)
+        signal.signal(signal.SIGINT, stop)
+
+        threads = [
+            threading.Thread(
+                target=run_worker,
+                args=(options["poll_interval"], stop_event),
+                name=f"generation-worker-{i}",
+            )
+            for i in range(options["concurrency"])
+        ]
+        for thread in threads:
+            thread.start()
+        self.stdout.write(f"generation worker 시작 (concurrency={options['concurrency']})")
+
+        for thread in threads:
+            thread.join()
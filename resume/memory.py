@@ -0,0 +1,91 @@
+# 자소서별 채팅 메모리
+# 최근 대화는 토큰 예산(settings.CHAT_MEMORY["TOKEN_BUDGET"]) 안에서 최대한 그대로 프롬프트에 넣고,
+# 예산을 넘는 오래된 대화는 Resume.chat_summary에 누적 요약합니다.
+# 요약에 반영된 대화는 summarized_chat_id 이후로는 다시 읽지 않으므로, 요약을 처음부터 다시 만들지 않습니다.
+import logging
+
+from django.conf import settings
+
+from resume.llm_routes import complete
+from resume.models import ChatHistory, Resume
+from utils.prompt_builder import build_prompt
+from utils.prompts import CHAT_SUMMARY_SECTIONS, CHAT_SUMMARY_SYSTEM_PROMPT
+from utils.tokens import count_tokens as _count_tokens
+
+logger = logging.getLogger(__name__)
+
+EMPTY_SUMMARY = "없음"
+
+
+def count_tokens(text):
+    return _count_tokens(text, settings.CHAT_MEMORY["TOKENIZER_MODEL"])
+
+
+def _format_turn(chat, include_response=True):
+    turn = f"고객: {chat.query}"
+    if include_response:
+        turn += f"\n컨설턴트: {chat.response}"
+    return turn
+
+
+def _fold_into_summary(resume, summary, chats):
+    # 예산을 넘은 대화들을 기존 요약에 합쳐 새 요약을 만들고 resume에 저장
+    prompt = build_prompt(
+        "chat_summary",
+        CHAT_SUMMARY_SYSTEM_PROMPT,
+        CHAT_SUMMARY_SECTIONS,
+        summary=summary or EMPTY_SUMMARY,
+        turns="\n\n".join(_format_turn(chat) for chat in chats),
+    )
+    try:
+        new_summary = complete("summary", prompt)
+    except Exception:
+        # 요약에 실패하면 이번 요청에서는 기존 요약을 사용하고 다음 요청에서 다시 시도
+        logger.exception("resume %s 채팅 요약 실패", resume.pk)
+        return summary
+
+    summarized_chat_id = max(chat.id for chat in chats)
+    # updated_at이 바뀌지 않도록 update()로 필요한 컬럼만 저장
+    Resume.objects.filter(pk=resume.pk).update(
+        chat_summary=new_summary, summarized_chat_id=summarized_chat_id
+    )
+    resume.chat_summary = new_summary
+    resume.summarized_chat_id = summarized_chat_id
+    return new_summary
+
+
+def build_chat_memory(resume):
+    """(대화 요약, 최근 대화 내역, 가장 최근에 생성된 자소서)를 반환합니다."""
+    budget = settings.CHAT_MEMORY["TOKEN_BUDGET"]
+    chats = ChatHistory.objects.filter(resume=resume).only("id", "query", "response")
+
+    # 첫 번째 대화는 자소서 생성 프롬프트이므로 대화 내역에서 제외
+    first_chat_id = chats.values_list("id", flat=True).first()
+    if first_chat_id is None:
+        # 채팅 기록이 없는 자소서(직접 작성 등)는 대화 내역 없이 현재 자소서 내용으로 대화
+        return resume.chat_summary or EMPTY_SUMMARY, EMPTY_SUMMARY, resume.content
+    latest_chat = chats.last()
+
+    # 아직 요약에 반영되지 않은 대화만 최신 순으로 조회
+    unsummarized = chats.filter(
+        id__gt=max(resume.summarized_chat_id or 0, first_chat_id)
+    ).order_by("-created_at", "-id")
+
+    recent_turns, overflow = [], []
+    used = 0
+    for chat in unsummarized:
+        # 가장 최근 대화의 응답은 현재 자소서로 따로 전달하므로 요구사항만 포함
+        turn = _format_turn(chat, include_response=chat.id != latest_chat.id)
+        tokens = count_tokens(turn)
+        if not overflow and used + tokens <= budget:
+            recent_turns.append(turn)
+            used += tokens
+        else:
+            overflow.append(chat)
+
+    summary = resume.chat_summary
+    if overflow:
+        summary = _fold_into_summary(resume, summary, list(reversed(overflow)))
+
+    history = "\n\n".join(reversed(recent_turns))
+    return summary or EMPTY_SUMMARY, history or EMPTY_SUMMARY, latest_chat.response
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.3 on 2026-10-17 12:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0008_generationjob"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="chathistory",
+            options={"ordering": ["created_at", "id"]},
+        ),
+        migrations.AlterModelOptions(
+            name="resume",
+            options={"ordering": ["-updated_at", "-id"]},
+        ),
+        migrations.AddIndex(
+            model_name="chathistory",
+            index=models.Index(
+                fields=["resume", "created_at", "id"],
+                name="resume_chat_resume__dc1391_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="resume",
+            index=models.Index(
+                fields=["user", "-updated_at", "-id"],
+                name="resume_resu_user_id_c31528_idx",
+            ),
+        ),
+    ]
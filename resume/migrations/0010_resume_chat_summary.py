@@ -0,0 +1,23 @@
+# Generated by Django 5.0.3 on 2026-10-17 12:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("resume", "0009_resume_chathistory_ordering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="resume",
+            name="chat_summary",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.AddField(
+            model_name="resume",
+            name="summarized_chat_id",
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -14,6 +14,17 @@ class Resume(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
     is_finished = models.BooleanField(default=False)
     is_liked = models.BooleanField(default=False)
+    chat_summary = models.TextField(blank=True, default="")  # 오래된 채팅의 누적 요약
+    summarized_chat_id = models.BigIntegerField(
+        null=True, blank=True
+    )  # chat_summary에 반영된 마지막 ChatHistory의 id
+
+    class Meta:
+        # 유저별 목록 조회가 (user, updated_at, id) 인덱스만으로 정렬까지 처리되도록 ordering과 인덱스를 맞춤
+        ordering = ["-updated_at", "-id"]
+        indexes = [
+            models.Index(fields=["user", "-updated_at", "-id"]),
+        ]
 
     def __str__(self):
         return self.title
@@ -25,3 +36,48 @@ class ChatHistory(models.Model):
     response = models.TextField(null=True)  # 챗봇의 응답
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["created_at", "id"]
+        indexes = [
+            models.Index(fields=["resume", "created_at", "id"]),
+        ]
+
+
+class GenerationJob(models.Model):
+    # 자소서 생성 / 챗봇 대화를 백그라운드에서 처리하기 위한 작업 (resume/jobs.py)
+    class Kind(models.TextChoices):
+        GENERATE = "generate"
+        CHAT = "chat"
+
+    class Status(models.TextChoices):
+        PENDING = "pending"
+        RUNNING = "running"
+        SUCCEEDED = "succeeded"
+        FAILED = "failed"
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    resume = models.ForeignKey(
+        Resume, on_delete=models.CASCADE, null=True, blank=True
+    )  # 채팅 대상 자소서 또는 생성된 자소서
+    kind = models.CharField(max_length=20, choices=Kind.choices)
+    status = models.CharField(
+        max_length=20, choices=Status.choices, default=Status.PENDING
+    )
+    payload = models.JSONField()  # 요청 데이터
+    result = models.JSONField(null=True, blank=True)  # 응답 데이터
+    error = models.TextField(blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    run_after = models.DateTimeField()  # 재시도 시 backoff 이후에 실행
+    started_at = models.DateTimeField(null=True, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"]),
+            models.Index(fields=["user", "status"]),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
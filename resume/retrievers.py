@@ -0,0 +1,138 @@
+# 자소서 예시 retriever
+# settings.RETRIEVER["BACKEND"]로 Pinecone(remote)과 local(NumPy) 중 하나를 선택합니다.
+# 두 backend 모두 Pinecone의 match 형식({"id", "score", "metadata"})으로 결과를 반환합니다.
+import json
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+EMBEDDINGS_FILENAME = "embeddings.npy"
+METADATA_FILENAME = "metadata.json"
+
+
+class BaseRetriever(ABC):
+    @abstractmethod
+    def retrieve(self, query_embedding, top_k):
+        """query_embedding과 가까운 top_k개의 match({"id", "score", "metadata"}) list를 반환합니다."""
+
+
+class PineconeRetriever(BaseRetriever):
+    def __init__(self, index_name):
+        self.index_name = index_name
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self):
+        # Pinecone client와 index handle은 한 번만 만들고 재사용 (Index()는 host 조회 요청을 보냄)
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    from pinecone import Pinecone
+
+                    self._index = Pinecone().Index(self.index_name)
+        return self._index
+
+    def retrieve(self, query_embedding, top_k):
+        retrieved_data = self.index.query(
+            vector=query_embedding, top_k=top_k, include_metadata=True
+        )
+        return retrieved_data["matches"]
+
+
+class LocalRetriever(BaseRetriever):
+    # index_dir/embeddings.npy : 정규화된 float32 (N, D) 행렬 (memory-map으로 로드)
+    # index_dir/metadata.json  : 각 행에 대응하는 {"id", "metadata"} 목록
+    def __init__(self, index_dir, ann=False):
+        index_dir = Path(index_dir)
+        try:
+            self.embeddings = np.load(index_dir / EMBEDDINGS_FILENAME, mmap_mode="r")
+            with open(index_dir / METADATA_FILENAME, encoding="utf-8") as f:
+                self.items = json.load(f)
+        except FileNotFoundError:
+            raise ImproperlyConfigured(
+                f"local retriever index가 없습니다: {index_dir} (manage.py build_local_index로 생성하세요)"
+            )
+        if len(self.items) != self.embeddings.shape[0]:
+            raise ImproperlyConfigured("local retriever의 embeddings와 metadata 개수가 다릅니다.")
+
+        self.ann_index = self._build_ann_index() if ann else None
+
+    def _build_ann_index(self):
+        try:
+            import hnswlib
+        except ImportError:
+            raise ImproperlyConfigured(
+                "RETRIEVER LOCAL_ANN을 사용하려면 hnswlib 패키지가 필요합니다."
+            )
+        count, dim = self.embeddings.shape
+        ann_index = hnswlib.Index(space="ip", dim=dim)
+        ann_index.init_index(max_elements=count, ef_construction=200, M=16)
+        ann_index.add_items(np.asarray(self.embeddings), np.arange(count))
+        ann_index.set_ef(64)
+        return ann_index
+
+    def retrieve(self, query_embedding, top_k):
+        top_k = min(top_k, len(self.items))
+        if top_k <= 0:
+            return []
+
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / np.linalg.norm(query)
+
+        if self.ann_index is not None:
+            labels, distances = self.ann_index.knn_query(query, k=top_k)
+            # inner product space의 distance는 1 - 내적
+            indices, scores = labels[0], 1.0 - distances[0]
+        else:
+            all_scores = self.embeddings @ query
+            candidates = np.argpartition(-all_scores, top_k - 1)[:top_k]
+            indices = candidates[np.argsort(-all_scores[candidates])]
+            scores = all_scores[indices]
+
+        return [
+            {
+                "id": self.items[i]["id"],
+                "score": float(score),
+                "metadata": self.items[i]["metadata"],
+            }
+            for i, score in zip(indices, scores)
+        ]
+
+
+def write_local_index(index_dir, embeddings, items):
+    index_dir = Path(index_dir)
+    index_dir.mkdir(parents=True, exist_ok=True)
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.save(index_dir / EMBEDDINGS_FILENAME, matrix)
+    with open(index_dir / METADATA_FILENAME, "w", encoding="utf-8") as f:
+        json.dump(items, f, ensure_ascii=False)
+
+
+_retriever = None
+_retriever_lock = threading.Lock()
+
+
+def get_retriever():
+    global _retriever
+    if _retriever is None:
+        with _retriever_lock:
+            if _retriever is None:
+                config = settings.RETRIEVER
+                backend = config.get("BACKEND", "pinecone")
+                if backend == "pinecone":
+                    _retriever = PineconeRetriever(config["PINECONE_INDEX_NAME"])
+                elif backend == "local":
+                    _retriever = LocalRetriever(
+                        config["LOCAL_INDEX_DIR"], ann=config.get("LOCAL_ANN", False)
+                    )
+                else:
+                    raise ImproperlyConfigured(
+                        f"지원하지 않는 RETRIEVER BACKEND입니다: {backend}"
+                    )
+    return _retriever
@@ -1,6 +1,6 @@
 from rest_framework import serializers
 
-from resume.models import Resume, ChatHistory
+from resume.models import Resume, ChatHistory, GenerationJob
 
 class GuidelineSerializer(serializers.Serializer):
     result = serializers.ListField(
@@ -11,12 +11,20 @@ class GenerateResumeSerializer(serializers.Serializer):
     title = serializers.CharField()
     position = serializers.CharField()
     company = serializers.CharField()
-    due_date = serializers.DateField(format="%Y-%m-%d")
+    due_date = serializers.DateField(format="%Y-%m-%d", allow_null=True)
     question = serializers.CharField()
     guidelines = serializers.ListField(child=serializers.CharField())
-    answers = serializers.ListField(child=serializers.CharField())
-    free_answer = serializers.CharField()
-    favor_info = serializers.CharField()
+    answers = serializers.ListField(child=serializers.CharField(allow_blank=True))
+    free_answer = serializers.CharField(allow_blank=True)
+    favor_info = serializers.CharField(allow_blank=True)
+
+    def validate(self, attrs):
+        # answers[i]는 guidelines[i]에 대한 답변
+        if len(attrs["answers"]) != len(attrs["guidelines"]):
+            raise serializers.ValidationError(
+                {"answers": "guidelines와 answers의 개수가 같아야 합니다."}
+            )
+        return attrs
 
 
 class PostResumeSerializer(serializers.ModelSerializer):
@@ -63,3 +71,18 @@ class ChatHistorySerializer(serializers.Serializer):
 class CombinedChatHistorySerializer(serializers.Serializer):
     count = serializers.IntegerField()
     results = ChatHistorySerializer(many=True)
+
+
+class GenerationJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = GenerationJob
+        fields = (
+            "id",
+            "kind",
+            "status",
+            "result",
+            "error",
+            "attempts",
+            "created_at",
+            "updated_at",
+        )
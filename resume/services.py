@@ -0,0 +1,359 @@
+import hashlib
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.shortcuts import get_object_or_404
+from django.utils.http import quote_etag
+
+from resume.guideline_parser import GuidelineParseError, parse_guidelines
+from resume.llm_routes import OutputValidationError, acomplete, complete
+from resume.models import Resume, ChatHistory
+from resume.serializers import PostResumeSerializer
+from resume.memory import build_chat_memory
+from resume.utils import aretrieve_with_deadline, retrieve_with_deadline
+from resumai.instrumentation import LLM_OUTPUT_PARSE
+from utils.openai_call import CHAT_MODEL, JSON_OBJECT
+from utils.prompt_builder import build_prompt
+from utils.prompts import (
+    CHAT_SECTIONS,
+    CHAT_SYSTEM_PROMPT,
+    GENERATE_SELF_INTRODUCTION_SECTIONS,
+    GENERATE_SELF_INTRODUCTION_SYSTEM_PROMPT,
+    GUIDELINE_REPAIR_SECTIONS,
+    GUIDELINE_REPAIR_SYSTEM_PROMPT,
+    GUIDELINE_SECTIONS,
+    GUIDELINE_SYSTEM_PROMPT,
+)
+from utils.tokens import count_tokens, truncate_tokens
+
+logger = logging.getLogger(__name__)
+
+# chat_edit 경로의 응답이 최근 자소서 길이의 이 비율보다 짧으면 FALLBACK_MODEL로 다시 생성
+CHAT_MIN_LENGTH_RATIO = 0.3
+
+
+class GenerationError(Exception):
+    # 재시도해도 결과가 달라지지 않는 생성 실패 (입력 오류 등)
+    pass
+
+
+def build_total_answer(guidelines, answers, free_answer):
+    # 답변을 guideline + answer + free_answer로 구성
+    total_answer = ""
+    for guideline, answer in zip(guidelines, answers):
+        # answer 값이 존재하는 경우에만 처리
+        if answer:
+            total_answer += guideline + "\n" + answer + "\n\n"
+    if free_answer:
+        total_answer += free_answer
+    return total_answer
+
+
+def format_examples(examples):
+    return "\n\n".join(
+        [
+            f"예시{i}) \nQuestion: {ex['metadata']['question']} \nAnswer: {ex['metadata']['answer']}"
+            for i, ex in enumerate(examples, start=1)
+        ]
+    )
+
+
+def pack_examples(examples):
+    """검색된 예시에서 중복 답변을 제외하고, 토큰 예산 안에 들어가도록 답변을 잘라 반환합니다."""
+    budget = settings.RETRIEVER["EXAMPLE_TOKEN_BUDGET"]
+    max_tokens = settings.RETRIEVER["EXAMPLE_MAX_TOKENS"]
+    packed, seen = [], set()
+    for example in examples:
+        question = example["metadata"]["question"]
+        answer = example["metadata"]["answer"].strip()
+        # 공백만 다른 같은 답변은 한 번만 사용
+        key = " ".join(answer.split())
+        if not key or key in seen:
+            continue
+        seen.add(key)
+
+        question_tokens = count_tokens(question, CHAT_MODEL)
+        limit = min(max_tokens, budget - question_tokens)
+        if limit <= 0:
+            break
+        truncated = truncate_tokens(answer, limit, CHAT_MODEL)
+        if truncated != answer:
+            truncated = truncated.rstrip() + " ..."
+        budget -= question_tokens + count_tokens(truncated, CHAT_MODEL)
+        packed.append({"metadata": {"question": question, "answer": truncated}})
+    return packed
+
+
+def _format_generate_prompt(data, total_answer, examples):
+    examples = pack_examples(examples)
+    sections = GENERATE_SELF_INTRODUCTION_SECTIONS
+    if not examples:
+        # retrieve를 사용하지 않으면 예시 구간 없이 생성
+        sections = [section for section in sections if section[0] != "examples"]
+    return build_prompt(
+        "generate",
+        GENERATE_SELF_INTRODUCTION_SYSTEM_PROMPT,
+        sections,
+        question=data["question"],
+        answer=total_answer,
+        favor_info=data["favor_info"],
+        examples=format_examples(examples),
+    )
+
+
+def build_generate_prompt(data):
+    """
+    예시를 retrieve하여 자소서 생성 프롬프트를 만듭니다.
+    임베딩 호출도 LLM 비용이므로 사용 횟수를 차감한 뒤에 호출해야 합니다.
+    """
+    total_answer = build_total_answer(
+        data["guidelines"], data["answers"], data["free_answer"]
+    )
+
+    # RETRIEVER["ENABLED"]가 false이면 임베딩 / 벡터 검색을 하지 않고,
+    # 검색이 실패하거나 deadline을 넘기면 예시 없이 작성
+    examples = []
+    if settings.RETRIEVER["ENABLED"]:
+        examples = retrieve_with_deadline(total_answer)
+    return _format_generate_prompt(data, total_answer, examples)
+
+
+async def abuild_generate_prompt(data):
+    total_answer = build_total_answer(
+        data["guidelines"], data["answers"], data["free_answer"]
+    )
+
+    examples = []
+    if settings.RETRIEVER["ENABLED"]:
+        examples = await aretrieve_with_deadline(total_answer)
+    return _format_generate_prompt(data, total_answer, examples)
+
+
+def save_generated_resume(user, data, prompt, generated_self_introduction):
+    """생성된 자소서와 첫 채팅 기록을 저장합니다. (저장된 자소서, 에러) 튜플을 반환합니다."""
+    serializer = PostResumeSerializer(
+        data={
+            "title": data["title"],
+            "company": data["company"],
+            "position": data["position"],
+            "question": data["question"],
+            "content": generated_self_introduction,
+            "due_date": data["due_date"],
+            "is_finished": False,
+            "is_liked": False,
+        }
+    )
+
+    # 데이터 유효성 검사
+    if not serializer.is_valid():
+        return None, serializer.errors
+
+    # 유효한 데이터의 경우, 자소서 저장
+    saved_instance = serializer.save(user=user)
+    resume = get_object_or_404(Resume, pk=saved_instance.id)
+    new_chat_history = ChatHistory(
+        resume=resume, query=str(prompt), response=generated_self_introduction
+    )
+    new_chat_history.save()
+    return saved_instance, None
+
+
+asave_generated_resume = sync_to_async(save_generated_resume)
+
+
+def generate_resume(user, data):
+    """프롬프트 작성부터 저장까지 자소서 생성 전체 과정을 수행합니다. (백그라운드 작업에서 사용)"""
+    prompt = build_generate_prompt(data)
+    generated_self_introduction = complete("generate", prompt)
+
+    saved_instance, errors = save_generated_resume(
+        user, data, prompt, generated_self_introduction
+    )
+    if errors is not None:
+        raise GenerationError(errors)
+    return saved_instance
+
+
+def build_chat_prompt(**values):
+    return build_prompt("chat", CHAT_SYSTEM_PROMPT, CHAT_SECTIONS, **values)
+
+
+def build_guideline_prompt(question):
+    return build_prompt(
+        "guideline", GUIDELINE_SYSTEM_PROMPT, GUIDELINE_SECTIONS, question=question
+    )
+
+
+def _guideline_repair_prompt(output):
+    return build_prompt(
+        "guideline_repair",
+        GUIDELINE_REPAIR_SYSTEM_PROMPT,
+        GUIDELINE_REPAIR_SECTIONS,
+        output=output,
+    )
+
+
+def _parse_or_none(output):
+    try:
+        return parse_guidelines(output)
+    except GuidelineParseError:
+        logger.warning("가이드라인 응답 형식 오류, repair 시도: %.200r", output)
+        return None
+
+
+def _parse_repaired(repaired):
+    try:
+        guidelines = parse_guidelines(repaired)
+    except GuidelineParseError:
+        LLM_OUTPUT_PARSE.inc(task="guideline", result="failed")
+        raise
+    LLM_OUTPUT_PARSE.inc(task="guideline", result="repaired")
+    return guidelines
+
+
+def _validate_guidelines(output):
+    guidelines = _parse_or_none(output)
+    if guidelines is not None:
+        LLM_OUTPUT_PARSE.inc(task="guideline", result="ok")
+        return guidelines
+
+    # 가이드라인을 다시 생성하지 않고 작은 모델로 형식만 고침
+    return _parse_repaired(
+        complete(
+            "repair", _guideline_repair_prompt(output), response_format=JSON_OBJECT
+        )
+    )
+
+
+async def _avalidate_guidelines(output):
+    guidelines = _parse_or_none(output)
+    if guidelines is not None:
+        LLM_OUTPUT_PARSE.inc(task="guideline", result="ok")
+        return guidelines
+
+    return _parse_repaired(
+        await acomplete(
+            "repair", _guideline_repair_prompt(output), response_format=JSON_OBJECT
+        )
+    )
+
+
+def generate_guidelines(question):
+    """
+    가이드라인 3개를 생성합니다.
+    repair로도 형식을 복구하지 못하면 FALLBACK_MODEL로 다시 생성하고, 그래도 실패하면 GuidelineParseError를 발생시킵니다.
+    """
+    return complete(
+        "guideline",
+        build_guideline_prompt(question),
+        validate=_validate_guidelines,
+        response_format=JSON_OBJECT,
+    )
+
+
+async def agenerate_guidelines(question):
+    return await acomplete(
+        "guideline",
+        build_guideline_prompt(question),
+        validate=_avalidate_guidelines,
+        response_format=JSON_OBJECT,
+    )
+
+
+def _chat_request(query, memory):
+    # 요구사항이 짧은 수정 요청이면 chat_edit 경로(작은 모델)로, 아니면 chat 경로로 처리
+    summary, history, recently_generated_resume = memory
+    prompt = build_chat_prompt(
+        query=query,
+        summary=summary,
+        history=history,
+        recently_generated_resume=recently_generated_resume,
+    )
+    max_query_tokens = settings.LLM_ROUTES["chat_edit"]["MAX_QUERY_TOKENS"]
+    if count_tokens(query, CHAT_MODEL) > max_query_tokens:
+        return "chat", prompt, None
+
+    def validate(output):
+        # 작은 모델이 자소서 대신 빈 응답이나 일부만 돌려준 경우 큰 모델로 다시 생성
+        if (
+            len(output.strip())
+            < len(recently_generated_resume or "") * CHAT_MIN_LENGTH_RATIO
+        ):
+            raise OutputValidationError(f"응답이 너무 짧습니다. ({len(output)}자)")
+        return output
+
+    return "chat_edit", prompt, validate
+
+
+def respond_to_chat(query, memory):
+    """memory: build_chat_memory(resume)가 반환한 (요약, 최근 대화, 최근 자소서)"""
+    task, prompt, validate = _chat_request(query, memory)
+    return complete(task, prompt, validate=validate)
+
+
+async def arespond_to_chat(query, memory):
+    task, prompt, validate = _chat_request(query, memory)
+    return await acomplete(task, prompt, validate=validate)
+
+
+def chat_with_resume(resume, query):
+    # 오래된 대화는 요약으로, 최근 대화는 토큰 예산 안에서 그대로 프롬프트에 포함
+    memory = build_chat_memory(resume)
+
+    # 챗봇으로부터 응답을 받음
+    chatbot_response = respond_to_chat(query, memory)
+
+    # 새로운 대화 기록을 생성하고 저장
+    new_chat_history = ChatHistory(
+        resume=resume, query=query, response=chatbot_response
+    )
+    new_chat_history.save()
+    return chatbot_response
+
+
+def flatten_chat_history(chats, first_chat_id):
+    # ChatHistory 한 행을 사용자 메시지(query)와 챗봇 메시지(response)로 나누어 변환
+    chat_data = []
+    for chat in chats:
+        if chat.query and chat.id != first_chat_id:
+            chat_data.append(
+                {"created_at": chat.created_at, "content": chat.query, "is_user": True}
+            )
+        if chat.response:
+            chat_data.append(
+                {
+                    "created_at": chat.created_at,
+                    "content": chat.response,
+                    "is_user": False,
+                }
+            )
+    return chat_data
+
+
+def load_chat_window(resume_id, limit):
+    # 최신 대화부터 limit + 1행만 (resume, created_at, id) 인덱스를 역순으로 읽음
+    # 한 행을 더 읽어서 이전 대화가 남아 있는지 확인하고, 남아 있지 않으면 가장 오래된 행이 첫 번째 대화
+    rows = list(
+        ChatHistory.objects.filter(resume_id=resume_id)
+        .order_by("-created_at", "-id")
+        .only("id", "query", "response", "created_at", "updated_at")[: limit + 1]
+    )
+    has_more = len(rows) > limit
+    if has_more:
+        rows = rows[:limit]
+    first_chat_id = None if has_more or not rows else rows[-1].id
+    return rows[::-1], first_chat_id, has_more
+
+
+def editor_etag(resume, chats, limit):
+    # 자소서 필드와 채팅 window의 (id, updated_at)이 같으면 응답 내용도 같음
+    # (is_liked 등은 update_fields로 저장되어 updated_at이 바뀌지 않으므로 필드 값 전체를 사용)
+    payload = json.dumps(
+        [resume, [(chat.id, chat.updated_at) for chat in chats], limit],
+        cls=DjangoJSONEncoder,
+        sort_keys=True,
+    )
+    return quote_etag(hashlib.sha256(payload.encode()).hexdigest())
@@ -1,3 +1,47 @@
-from django.test import TestCase
+from django.test import SimpleTestCase
 
-# Create your tests here.
+from resume.guideline_parser import GuidelineParseError, parse_guidelines
+
+GUIDELINES = [
+    "지원 동기를 작성해 주세요.",
+    "회사와 본인의 적합성을 서술해 주세요.",
+    "입사 후 목표를 작성해 주세요.",
+]
+
+
+class ParseGuidelinesTest(SimpleTestCase):
+    def test_json_object(self):
+        text = '{"guidelines": ["%s", "%s", "%s"]}' % tuple(GUIDELINES)
+        self.assertEqual(parse_guidelines(text), GUIDELINES)
+
+    def test_code_fence_and_surrounding_text(self):
+        text = "가이드라인입니다.\n```json\n%s\n```" % GUIDELINES
+        self.assertEqual(parse_guidelines(text), GUIDELINES)
+
+    def test_quote_inside_single_quoted_item(self):
+        text = "['회사의 'core value'를 작성해 주세요.', '%s', '%s']" % tuple(
+            GUIDELINES[1:]
+        )
+        self.assertEqual(
+            parse_guidelines(text),
+            ["회사의 'core value'를 작성해 주세요.", *GUIDELINES[1:]],
+        )
+
+    def test_bullet_list(self):
+        text = "\n".join(f"- {guideline}" for guideline in GUIDELINES)
+        self.assertEqual(parse_guidelines(text), GUIDELINES)
+
+    def test_malformed_input_raises_parse_error(self):
+        for text in (
+            None,
+            "",
+            "가이드라인을 만들 수 없습니다.",
+            "{[1]: 2}",
+            "[[[[[[",
+            "[" * 10000 + "]" * 10000,
+            '{"guidelines": ["하나", "둘"]}',
+            '{"guidelines": [1, 2, 3]}',
+        ):
+            with self.subTest(text=text and text[:20]):
+                with self.assertRaises(GuidelineParseError):
+                    parse_guidelines(text)
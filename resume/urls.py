@@ -1,20 +1,52 @@
+from django.conf import settings
 from django.urls import path
 from resume import views
 
+if settings.ASYNC_LLM_VIEWS:
+    # ASGI 모드: LLM 엔드포인트를 async view로 교체 (URL은 동일)
+    from resume import async_views
+
+    GetGuidelinesView = async_views.AsyncGetGuidelinesView
+    GenerateResumeView = async_views.AsyncGenerateResumeView
+    GenerateResumeStreamView = async_views.AsyncGenerateResumeStreamView
+    ChatView = async_views.AsyncChatView
+else:
+    GetGuidelinesView = views.GetGuidelinesView
+    GenerateResumeView = views.GenerateResumeView
+    GenerateResumeStreamView = views.GenerateResumeStreamView
+    ChatView = views.ChatView
+
 
 urlpatterns = [
     path("all", views.GetAllResumeView.as_view(), name="get_all_resume"),
-    path("guidelines", views.GetGuidelinesView.as_view(), name="get_guidelines"),
-    path("generate", views.GenerateResumeView.as_view(), name="generate_resume"),
+    path("guidelines", GetGuidelinesView.as_view(), name="get_guidelines"),
+    path("generate", GenerateResumeView.as_view(), name="generate_resume"),
+    path(
+        "generate/stream",
+        GenerateResumeStreamView.as_view(),
+        name="generate_resume_stream",
+    ),
     # path("", views.PostResumeView.as_view(), name="post_resume"),
     path("update/<int:id>", views.UpdateResumeView.as_view(), name="update_resume"),
     path("scrap/<int:id>", views.ScrapResumeView.as_view(), name="scrap_resume"),
-    path("<int:id>/chat", views.ChatView.as_view(), name="chat"),
+    path("<int:id>/chat", ChatView.as_view(), name="chat"),
     path("<int:pk>", views.GetResumeView.as_view(), name="update_resume"),
     path(
         "<int:pk>/chatHistory",
         views.GetChatHistoryView.as_view(),
         name="get_chat_history",
     ),
+    path(
+        "<int:pk>/editor",
+        views.GetResumeEditorView.as_view(),
+        name="get_resume_editor",
+    ),
     path("delete/<int:pk>", views.DeleteResumeView.as_view(), name="delete_resume"),
+    path(
+        "jobs/generate",
+        views.SubmitGenerateResumeJobView.as_view(),
+        name="submit_generate_resume_job",
+    ),
+    path("<int:id>/chat/jobs", views.SubmitChatJobView.as_view(), name="submit_chat_job"),
+    path("jobs/<int:pk>", views.GetGenerationJobView.as_view(), name="get_generation_job"),
 ]
@@ -1,44 +1,102 @@
-import os
-from pathlib import Path
-import environ
+# 자소서 예시 retrieve (임베딩 + 벡터 검색)
+# 생성 요청에서는 retrieve를 별도 스레드(async view에서는 task)에서 실행하고,
+# settings.RETRIEVER["DEADLINE"]까지 끝나지 않으면 기다리지 않고 예시 없이 생성합니다.
+import asyncio
+import contextvars
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from functools import lru_cache
 
-from pinecone import Pinecone
-from utils.openai_call import get_embedding
+from asgiref.sync import sync_to_async
+from django.conf import settings
 
-from langchain_openai import ChatOpenAI
-from langchain.chains import ConversationChain
-from langchain.memory import ConversationBufferMemory
+from resume.retrievers import get_retriever
+from resumai.instrumentation import record_span, span
+from utils.openai_call import aget_embedding, get_embedding
 
-env = environ.Env(DEBUG=(bool, False))
-BASE_DIR = Path(__file__).resolve().parent.parent
-environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
-
-pc = Pinecone(api_key=os.environ.get("PINECONE_API_KEY"))
+logger = logging.getLogger(__name__)
 
 
 def retrieve_similar_answers(user_qa):
     try:
-        pc = Pinecone()
-        index = pc.Index("resumai-self-introduction-index")
         query_embedding = get_embedding(user_qa)
-        retrieved_data = index.query(
-            vector=query_embedding, top_k=2, include_metadata=True
-        )
-        return retrieved_data["matches"]
+        with span("vector_query"):
+            return get_retriever().retrieve(
+                query_embedding, top_k=settings.RETRIEVER["TOP_K"]
+            )
+
+    except Exception:
+        logger.exception("유사한 자소서 예시 검색 실패")
+        return []
+
+
+async def aretrieve_similar_answers(user_qa):
+    try:
+        query_embedding = await aget_embedding(user_qa)
+        # Pinecone SDK는 동기 클라이언트이므로 event loop를 막지 않도록 별도 스레드에서 실행
+        with span("vector_query"):
+            return await sync_to_async(
+                get_retriever().retrieve, thread_sensitive=False
+            )(query_embedding, top_k=settings.RETRIEVER["TOP_K"])
+
+    except Exception:
+        logger.exception("유사한 자소서 예시 검색 실패")
+        return []
 
-    except Exception as e:
-        print(e)
+
+@lru_cache(maxsize=None)
+def _retrieval_executor():
+    return ThreadPoolExecutor(
+        max_workers=settings.RETRIEVER["MAX_WORKERS"], thread_name_prefix="retrieval"
+    )
+
+
+def _log_deadline_exceeded():
+    logger.warning(
+        "유사한 자소서 예시 검색이 %s초 안에 끝나지 않아 예시 없이 생성합니다.",
+        settings.RETRIEVER["DEADLINE"],
+    )
+
+
+def retrieve_with_deadline(user_qa):
+    """
+    retrieve 결과를 settings.RETRIEVER["DEADLINE"]까지만 기다립니다. 실패하거나 deadline을 넘기면 빈 list를 반환합니다.
+    Pinecone / OpenAI 호출을 중간에 멈출 수 없으므로 별도 스레드에서 실행하고 기다리는 시간만 제한합니다.
+    """
+    started = time.perf_counter()
+    # 요청별 구간 측정(span)이 같은 요청에 기록되도록 context를 복사해서 실행
+    future = _retrieval_executor().submit(
+        contextvars.copy_context().run, retrieve_similar_answers, user_qa
+    )
+    try:
+        return future.result(timeout=settings.RETRIEVER["DEADLINE"])
+    # Python 3.10에서는 concurrent.futures.TimeoutError가 builtin TimeoutError와 다른 클래스
+    except FutureTimeoutError:
+        # 늦게 끝난 검색도 임베딩 캐시에는 저장되므로 같은 답변으로 다시 요청하면 빨라짐
+        _log_deadline_exceeded()
         return []
+    finally:
+        record_span("retrieval_wait", time.perf_counter() - started)
 
 
-llm = ChatOpenAI(verbose=True, temperature=0, model_name="gpt-4")
-memory = ConversationBufferMemory()
+# deadline을 넘겨 더 이상 기다리지 않는 retrieve task (끝날 때까지 참조를 유지해 GC되지 않도록 함)
+_late_retrievals = set()
 
 
-def run_llm(query: str, chat_history: list[dict[str, any]]) -> any:
-    # for chat in chat_history:
-    #     memory.save_context(
-    #         inputs={"human": chat["query"]}, outputs={"ai": chat["response"]}
-    #     )
-    conversation = ConversationChain(llm=llm, verbose=True)
-    return conversation.predict(input=query)
+async def aretrieve_with_deadline(user_qa):
+    started = time.perf_counter()
+    task = asyncio.create_task(aretrieve_similar_answers(user_qa))
+    try:
+        # shield: deadline을 넘겨도 task를 취소하지 않고 끝까지 실행해 임베딩 캐시를 채움 (sync 버전과 동일)
+        return await asyncio.wait_for(
+            asyncio.shield(task), timeout=settings.RETRIEVER["DEADLINE"]
+        )
+    except asyncio.TimeoutError:
+        _late_retrievals.add(task)
+        task.add_done_callback(_late_retrievals.discard)
+        _log_deadline_exceeded()
+        return []
+    finally:
+        record_span("retrieval_wait", time.perf_counter() - started)
@@ -1,5 +1,4 @@
 import json
-from datetime import datetime
 
 from django.http import Http404
 from django.shortcuts import get_object_or_404
@@ -7,9 +6,9 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
-from rest_framework.pagination import PageNumberPagination
 from rest_framework import serializers
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils.http import parse_etags
 
 from drf_spectacular.utils import (
     extend_schema,
@@ -18,28 +17,53 @@ from drf_spectacular.utils import (
     OpenApiExample,
 )
 
-from resume.models import Resume, ChatHistory
+from accounts.quota import (
+    QUOTA_EXCEEDED_MESSAGE,
+    QuotaExceeded,
+    consume_quota,
+    llm_quota,
+    refund_quota,
+)
+from resumai.pagination import (
+    CURSOR_PAGINATION_PARAMETERS,
+    CursorOrPageNumberPagination,
+)
+from resume.guideline_cache import get_guideline_cache
+from resume.jobs import JobLimitExceeded, submit_job
+from resume.llm_routes import complete, route_model
+from resume.models import Resume, ChatHistory, GenerationJob
 from resume.serializers import (
     GenerateResumeSerializer,
     PostResumeSerializer,
     UpdateResumeSerializer,
     ChatHistorySerializer, GuidelineSerializer,
+    GenerationJobSerializer,
 )
-from resume.utils import retrieve_similar_answers, run_llm
-from utils.openai_call import get_chat_openai
-from utils.prompts import (
-    GUIDELINE_PROMPT,
-    GENERATE_SELF_INTRODUCTION_PROMPT,
-    CHAT_PROMPT,
+from resume.services import (
+    build_generate_prompt,
+    chat_with_resume,
+    editor_etag,
+    flatten_chat_history,
+    generate_guidelines,
+    load_chat_window,
+    save_generated_resume,
 )
+from utils.openai_call import stream_chat_openai
+
+
+def _quota_exceeded_response():
+    return Response(
+        {"error": QUOTA_EXCEEDED_MESSAGE}, status=status.HTTP_429_TOO_MANY_REQUESTS
+    )
 
 
-class GetAllResumeView(APIView, PageNumberPagination):
+class GetAllResumeView(APIView, CursorOrPageNumberPagination):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
         summary="전체 자소서 조회",
-        description="사용자가 작성한 전체 자기소개서를 받아옵니다.",
+        description="사용자가 작성한 전체 자기소개서를 최근 수정 순으로 받아옵니다.",
+        parameters=CURSOR_PAGINATION_PARAMETERS,
         responses={
             200: inline_serializer(
                 name="GetAllResumeResponse",
@@ -85,12 +109,22 @@ class GetGuidelinesView(APIView):
     )
     def get(self, request):
         question = request.GET.get("question")
+
+        # 이전에 같은(또는 비슷한) 질문으로 생성한 가이드라인이 있으면 바로 반환
+        guideline_cache = get_guideline_cache()
+        cached_guideline_list = guideline_cache.get(question)
+        if cached_guideline_list is not None:
+            return JsonResponse({"result": cached_guideline_list})
+
         try:
-            prompt = GUIDELINE_PROMPT.format(question=question)
-            guideline_string = get_chat_openai(prompt)
-            guideline_list = json.loads(guideline_string.replace("'", '"'))
+            # 캐시에 없는 경우에만 LLM 사용 횟수를 차감
+            with llm_quota(request.user, "guideline"):
+                guideline_list = generate_guidelines(question)
+            guideline_cache.set(question, guideline_list)
             guideline_json = {"result": guideline_list}
             return JsonResponse(guideline_json)
+        except QuotaExceeded:
+            return _quota_exceeded_response()
         except Exception as e:
             error_message = {
                 "error": "가이드라인 생성 중 오류가 발생했습니다. 질문을 올바르게 입력해 주세요."
@@ -136,80 +170,87 @@ class GenerateResumeView(APIView):
         ],
     )
     def post(self, request):
-        serializer = GenerateResumeSerializer(data=request.data)
+        # 자소서 생성 (예시 retrieve의 임베딩 호출도 사용 횟수를 차감한 뒤에 시작)
+        try:
+            with llm_quota(request.user, "generate"):
+                prompt = build_generate_prompt(request.data)
+                generated_self_introduction = complete("generate", prompt)
+        except QuotaExceeded:
+            return _quota_exceeded_response()
+
+        saved_instance, errors = save_generated_resume(
+            request.user, request.data, prompt, generated_self_introduction
+        )
+        if errors is not None:
+            # 데이터가 유효하지 않은 경우, 에러 메시지 반환
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
 
-        title = request.data["title"]
-        position = request.data["position"]
-        company = request.data["company"]
-        due_date = request.data["due_date"]
-        question = request.data["question"]
-        guidelines = request.data["guidelines"]
-        answers = request.data["answers"]
-        free_answer = request.data["free_answer"]
-        favor_info = request.data["favor_info"]
-
-        # 답변을 guideline + answer + free_answer로 구성
-        total_answer = ""
-        for index, answer in enumerate(answers):
-            # answer 값이 존재하는 경우에만 처리
-            if answer:
-                total_answer += guidelines[index] + "\n" + answer + "\n\n"
-        if free_answer:
-            total_answer += free_answer
-
-        # 예시 retrieve
-        examples = retrieve_similar_answers(total_answer)
-        if len(examples) == 0:
-            error_message = {
-                "error": "유사한 질문을 가져오는 도중 문제가 발생했습니다. 다시 시도해 주세요."
-            }
-            return JsonResponse(error_message, status=500)
+        return Response({"id": saved_instance.id}, status=status.HTTP_201_CREATED)
 
-        examples_str = "\n\n".join(
-            [
-                f"예시{i}) \nQuestion: {ex['metadata']['question']} \nAnswer: {ex['metadata']['answer']}"
-                for i, ex in enumerate(examples, start=1)
-            ]
-        )
 
-        # 프롬프트 작성
-        prompt = GENERATE_SELF_INTRODUCTION_PROMPT.format(
-            question=question,
-            answer=total_answer,
-            favor_info=favor_info,
-            examples=examples_str,
-        )
+def _sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
 
-        # 자소서 생성
-        generated_self_introduction = get_chat_openai(prompt)
 
-        serializer = PostResumeSerializer(
-            data={
-                "title": title,
-                "company": company,
-                "position": position,
-                "question": question,
-                "content": generated_self_introduction,
-                "due_date": due_date,
-                "is_finished": False,
-                "is_liked": False,
-            }
-        )
+class GenerateResumeStreamView(APIView):
+    permission_classes = [IsAuthenticated]
 
-        # 데이터 유효성 검사
-        if serializer.is_valid():
-            # 유효한 데이터의 경우, 자소서 저장
-            saved_instance = serializer.save(user=request.user)
-            resume = get_object_or_404(Resume, pk=saved_instance.id)
-            new_chat_history = ChatHistory(
-                resume=resume, query=prompt, response=generated_self_introduction
+    @extend_schema(
+        summary="자소서 생성 (스트리밍)",
+        description=(
+            "답변을 기반으로 자기소개서를 생성하고, 생성되는 토큰을 Server-Sent Events로 전달합니다.\n\n"
+            "- `token`: 생성된 토큰 조각 (`{\"content\": \"...\"}`)\n"
+            "- `done`: 생성 완료 후 저장된 자소서의 ID (`{\"id\": 1}`)\n"
+            "- `error`: 생성 또는 저장 중 발생한 오류\n\n"
+            "생성 도중 클라이언트 연결이 끊기면 생성을 중단하고 자소서를 저장하지 않습니다."
+        ),
+        request=GenerateResumeSerializer,
+        responses={200: {"type": "string", "format": "text/event-stream"}},
+    )
+    def post(self, request):
+        user = request.user
+        data = request.data
+
+        try:
+            consume_quota(user, "generate")
+        except QuotaExceeded:
+            return _quota_exceeded_response()
+        try:
+            prompt = build_generate_prompt(data)
+        except Exception:
+            refund_quota(user, "generate")
+            raise
+
+        def event_stream():
+            tokens = stream_chat_openai(prompt, model=route_model("generate"))
+            chunks = []
+            try:
+                for token in tokens:
+                    chunks.append(token)
+                    yield _sse("token", {"content": token})
+            except Exception:
+                refund_quota(user, "generate")
+                yield _sse("error", {"error": "자기소개서 생성 중 오류가 발생했습니다."})
+                return
+            finally:
+                # 클라이언트 연결이 끊기면 GeneratorExit로 여기에 도달하며, 생성을 중단하고 저장하지 않음
+                tokens.close()
+
+            saved_instance, errors = save_generated_resume(
+                user, data, prompt, "".join(chunks)
             )
-            new_chat_history.save()
+            if errors is not None:
+                yield _sse("error", {"error": errors})
+                return
+            yield _sse("done", {"id": saved_instance.id})
 
-            return Response({"id": saved_instance.id}, status=status.HTTP_201_CREATED)
-        else:
-            # 데이터가 유효하지 않은 경우, 에러 메시지 반환
-            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        response = StreamingHttpResponse(
+            event_stream(), content_type="text/event-stream"
+        )
+        response["Cache-Control"] = "no-cache"
+        # nginx가 응답을 버퍼링하지 않고 바로 전달하도록 설정
+        response["X-Accel-Buffering"] = "no"
+        return response
 
 
 class GetResumeView(APIView):
@@ -327,66 +368,37 @@ class ChatView(APIView):
     )
     def post(self, request, id):
         user = request.user
-        today = datetime.now().date()
-
-        # # 채팅 횟수 count
-        # if user.chat_count <= 0:
-        #     return JsonResponse(
-        #         {"error": "채팅 횟수가 모두 소진되었습니다."},
-        #         status=status.HTTP_403_FORBIDDEN,
-        #     )
-
         query = request.data.get("query", "")
 
         resume = get_object_or_404(Resume, pk=id)
 
-        # 해당 resume에 대한 이전 대화 내역을 가져옴
-        chat_history_instances = ChatHistory.objects.filter(resume=resume)
-        chat_history = [
-            {"query": instance.query, "response": instance.response}
-            for instance in chat_history_instances
-        ]
-
-        recently_generated_resume = chat_history[-1]["response"]
-
-        # context length 이슈로 chat_memory를 저장하지 못했음.
-        # --> 일단은 모든 채팅을 프롬프트에 본 챗봇이 자기소개서 작성 어시스턴트임을 나타내는 프롬프트 작성
-        # if len(chat_history) == 1:
-        prompted_query = CHAT_PROMPT.format(query=query, recently_generated_resume=recently_generated_resume)
-
-        # 챗봇으로부터 응답을 받음
-        # chatbot_response = run_llm(query=prompted_query, chat_history=chat_history)
-        chatbot_response = run_llm(query=prompted_query, chat_history=None)
-
-        # 새로운 대화 기록을 생성하고 저장
-        new_chat_history = ChatHistory(
-            resume=resume, query=query, response=chatbot_response
-        )
-        new_chat_history.save()
-        # user.available_chat_count -= 1
-        user.save()
-        # else:
-        #     # 챗봇으로부터 응답을 받음
-        #     chatbot_response = run_llm(query=query, chat_history=chat_history)
-        #
-        #     # 새로운 대화 기록을 생성하고 저장
-        #     new_chat_history = ChatHistory(
-        #         resume=resume, query=query, response=chatbot_response
-        #     )
-        #     new_chat_history.save()
-        #     # user.available_chat_count -= 1
-        #     user.save()
+        # 챗봇으로부터 응답을 받고 새로운 대화 기록을 저장
+        try:
+            with llm_quota(user, "chat"):
+                chatbot_response = chat_with_resume(resume, query)
+        except QuotaExceeded:
+            return _quota_exceeded_response()
 
         # 챗봇의 응답을 반환
         return JsonResponse({"answer": chatbot_response}, status=status.HTTP_200_OK)
 
 
-class GetChatHistoryView(APIView):
+class ChatHistoryPagination(CursorOrPageNumberPagination):
+    # cursor 방식에서는 최신 대화부터 과거 방향으로 페이지를 나눔 (next = 더 이전 대화)
+    cursor_ordering = ("-created_at", "-id")
+
+
+class GetChatHistoryView(APIView, ChatHistoryPagination):
     permission_classes = [IsAuthenticated]
 
     @extend_schema(
         summary="채팅 내역 조회",
-        description="채팅 내역을 반환합니다.",
+        description=(
+            "채팅 내역을 반환합니다. 기본적으로 전체 내역을 반환하며, "
+            "`pagination=cursor`를 지정하면 최신 대화부터 `size`개의 대화 단위로 나누어 반환합니다. "
+            "(각 페이지의 `results`는 시간 순으로 정렬되며, `next`는 더 이전 대화를 가리킵니다.)"
+        ),
+        parameters=CURSOR_PAGINATION_PARAMETERS,
         responses={
             200: inline_serializer(
                 name="GetChatHistoryResponse",
@@ -399,26 +411,19 @@ class GetChatHistoryView(APIView):
     )
     def get(self, request, pk):
         resume = get_object_or_404(Resume, pk=pk)
-        queryset = ChatHistory.objects.filter(resume=resume).order_by("-created_at").reverse()
+        # (resume, created_at, id) 인덱스 순서로 조회
+        queryset = ChatHistory.objects.filter(resume=resume)
 
-        # 첫 번째 항목 제외
-        # queryset = queryset[1:]
+        # 첫 번째 대화의 query(자소서 생성 프롬프트)는 제외
+        first_chat_id = queryset.values_list("id", flat=True).first()
+
+        if self.is_cursor_request(request):
+            page = self.paginate_queryset(queryset, request, view=self)
+            chat_data = flatten_chat_history(reversed(page), first_chat_id)
+            return self.get_paginated_response(chat_data)
 
         # 새로운 형식으로 데이터를 변환
-        chat_data = []
-        for index, chat in enumerate(queryset):
-            if chat.query and index != 0:
-                chat_data.append({
-                    "created_at": chat.created_at,
-                    "content": chat.query,
-                    "is_user": True
-                })
-            if chat.response:
-                chat_data.append({
-                    "created_at": chat.created_at,
-                    "content": chat.response,
-                    "is_user": False
-                })
+        chat_data = flatten_chat_history(queryset, first_chat_id)
 
         return Response({
             "count": len(chat_data),
@@ -426,6 +431,85 @@ class GetChatHistoryView(APIView):
         }, status=status.HTTP_200_OK)
 
 
+class GetResumeEditorView(APIView):
+    # 편집 화면에 필요한 자소서와 최근 채팅을 한 번에 반환 (GetResumeView + GetChatHistoryView)
+    permission_classes = [IsAuthenticated]
+    default_limit = 20
+    max_limit = 100
+
+    @extend_schema(
+        summary="자소서 편집 화면 조회",
+        description=(
+            "자소서 디테일과 최근 채팅 메시지 `limit`개를 함께 반환합니다. "
+            "(`chat.results`는 시간 순으로 정렬되며, 더 이전 메시지가 있으면 `chat.has_more`가 true입니다. "
+            "이전 메시지는 `/resume/{id}/chatHistory?pagination=cursor`로 조회합니다.) "
+            "응답의 `ETag`를 `If-None-Match` 헤더로 보내면 변경이 없는 경우 304를 반환합니다."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="limit",
+                type=int,
+                description=f"반환할 최근 채팅 메시지 수 (기본값: {default_limit}, 최대: {max_limit})",
+            ),
+        ],
+        responses={
+            200: inline_serializer(
+                name="GetResumeEditorResponse",
+                fields={
+                    "resume": PostResumeSerializer(),
+                    "chat": inline_serializer(
+                        name="EditorChatWindow",
+                        fields={
+                            "has_more": serializers.BooleanField(),
+                            "results": ChatHistorySerializer(many=True),
+                        },
+                    ),
+                },
+            ),
+            304: None,
+        },
+    )
+    def get(self, request, pk):
+        try:
+            limit = int(request.query_params.get("limit", self.default_limit))
+        except ValueError:
+            return Response(
+                {"error": "limit은 정수여야 합니다."}, status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = min(max(limit, 1), self.max_limit)
+
+        # 소유권 확인과 조회를 하나의 query로 처리하고, 응답에 필요한 컬럼만 읽음
+        resume = (
+            Resume.objects.filter(pk=pk, user=request.user)
+            .values(*PostResumeSerializer.Meta.fields)
+            .first()
+        )
+        if resume is None:
+            raise Http404
+
+        # 한 행에서 최대 2개의 메시지가 나오므로 limit행이면 limit개의 메시지를 채우기에 충분함
+        chats, first_chat_id, has_more = load_chat_window(pk, limit)
+
+        etag = editor_etag(resume, chats, limit)
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+        messages = flatten_chat_history(chats, first_chat_id)
+        if len(messages) > limit:
+            messages = messages[-limit:]
+            has_more = True
+
+        return Response(
+            {
+                "resume": PostResumeSerializer(resume).data,
+                "chat": {"has_more": has_more, "results": messages},
+            },
+            status=status.HTTP_200_OK,
+            headers=headers,
+        )
+
+
 class DeleteResumeView(APIView):
     permission_classes = [IsAuthenticated]
 
@@ -456,3 +540,95 @@ class DeleteResumeView(APIView):
             {"status": "success", "message": "Resume deleted successfully."},
             status=status.HTTP_204_NO_CONTENT,
         )
+
+
+JOB_LIMIT_ERROR_MESSAGE = "이미 처리 중인 생성 요청이 많습니다. 잠시 후 다시 시도해 주세요."
+
+
+class SubmitGenerateResumeJobView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="자소서 생성 작업 등록",
+        description=(
+            "자기소개서 생성을 백그라운드 작업으로 등록하고 작업 ID를 바로 반환합니다. "
+            "`/resume/jobs/{id}`로 상태를 조회하며, 완료되면 `result.id`에 생성된 자소서의 ID가 담깁니다."
+        ),
+        request=GenerateResumeSerializer,
+        responses={202: GenerationJobSerializer},
+    )
+    def post(self, request):
+        # 잘못된 요청이 worker에서 실패하지 않도록 등록 전에 검사
+        serializer = GenerateResumeSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            with llm_quota(request.user, GenerationJob.Kind.GENERATE):
+                job = submit_job(
+                    request.user, GenerationJob.Kind.GENERATE, request.data
+                )
+        except QuotaExceeded:
+            return _quota_exceeded_response()
+        except JobLimitExceeded:
+            return Response(
+                {"error": JOB_LIMIT_ERROR_MESSAGE},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+        return Response(
+            GenerationJobSerializer(job).data, status=status.HTTP_202_ACCEPTED
+        )
+
+
+class SubmitChatJobView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="챗봇 대화 작업 등록",
+        description=(
+            "챗봇 대화를 백그라운드 작업으로 등록하고 작업 ID를 바로 반환합니다. "
+            "`/resume/jobs/{id}`로 상태를 조회하며, 완료되면 `result.answer`에 챗봇의 응답이 담깁니다."
+        ),
+        request={
+            "application/json": {
+                "type": "object",
+                "properties": {
+                    "query": {"type": "string"},
+                },
+            },
+        },
+        responses={202: GenerationJobSerializer},
+    )
+    def post(self, request, id):
+        resume = get_object_or_404(Resume, pk=id, user=request.user)
+        try:
+            with llm_quota(request.user, GenerationJob.Kind.CHAT):
+                job = submit_job(
+                    request.user,
+                    GenerationJob.Kind.CHAT,
+                    {"query": request.data.get("query", "")},
+                    resume=resume,
+                )
+        except QuotaExceeded:
+            return _quota_exceeded_response()
+        except JobLimitExceeded:
+            return Response(
+                {"error": JOB_LIMIT_ERROR_MESSAGE},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+            )
+        return Response(
+            GenerationJobSerializer(job).data, status=status.HTTP_202_ACCEPTED
+        )
+
+
+class GetGenerationJobView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    @extend_schema(
+        summary="생성 작업 상태 조회",
+        description="백그라운드 작업의 상태(pending, running, succeeded, failed)와 결과를 반환합니다.",
+        responses={200: GenerationJobSerializer},
+    )
+    def get(self, request, pk):
+        job = get_object_or_404(GenerationJob, pk=pk, user=request.user)
+        return Response(GenerationJobSerializer(job).data, status=status.HTTP_200_OK)
@@ -0,0 +1,98 @@
+# 임베딩 캐시
+# (모델, 텍스트)의 content hash를 key로 임베딩을 저장합니다.
+# 프로세스 내 LRU에 먼저 저장하고, path가 주어지면 sqlite 파일에도 저장하여 재시작 후에도 재사용합니다.
+import hashlib
+import sqlite3
+import threading
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+
+
+def embedding_key(text, model):
+    return hashlib.sha256(f"{model}\0{text}".encode()).hexdigest()
+
+
+class EmbeddingCache:
+    def __init__(self, path=None, max_entries=10000):
+        self.path = path
+        self.max_entries = max_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        if self.path:
+            try:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                with self._connection() as conn:
+                    conn.execute(
+                        "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+                    )
+            except (OSError, sqlite3.Error):
+                # 쓰기 가능한 경로가 아니면 메모리 캐시만 사용
+                self.path = None
+
+    def _connection(self):
+        # sqlite connection은 스레드 간에 공유하지 않음
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+    def get_many(self, keys):
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = vector
+
+        missing = [key for key in keys if key not in found]
+        if missing and self.path:
+            rows = []
+            try:
+                # sqlite의 bind 변수 개수 제한을 넘지 않도록 나누어 조회
+                for start in range(0, len(missing), 500):
+                    chunk = missing[start : start + 500]
+                    rows += self._connection().execute(
+                        f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})",
+                        chunk,
+                    ).fetchall()
+            except sqlite3.Error:
+                pass
+            persisted = {
+                key: np.frombuffer(blob, dtype=np.float32).tolist() for key, blob in rows
+            }
+            self._remember(persisted)
+            found.update(persisted)
+        return found
+
+    def set_many(self, items):
+        if not items:
+            return
+        self._remember(items)
+        if self.path:
+            try:
+                with self._connection() as conn:
+                    conn.executemany(
+                        "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                        [
+                            (key, np.asarray(vector, dtype=np.float32).tobytes())
+                            for key, vector in items.items()
+                        ],
+                    )
+            except sqlite3.Error:
+                # 디스크 캐시 저장에 실패해도 임베딩 결과는 그대로 사용
+                pass
+
+    def _remember(self, items):
+        with self._lock:
+            for key, vector in items.items():
+                self._memory[key] = vector
+                self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
@@ -1,27 +1,300 @@
-from openai import OpenAI
 import environ
+import json
+import time
+from functools import lru_cache
 from pathlib import Path
 import os
+from types import SimpleNamespace
+
+from resumai.instrumentation import (
+    record_prompt,
+    record_span,
+    record_token_usage,
+    span,
+)
+from utils.embedding_cache import EmbeddingCache, embedding_key
+from utils.prompt_builder import Prompt, to_messages
+from utils.single_flight import RedisFlightLock, SingleFlight, flight_key
 
 env = environ.Env(DEBUG=(bool, False))
 BASE_DIR = Path(__file__).resolve().parent.parent
 environ.Env.read_env(os.path.join(BASE_DIR, ".env"))
 
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
+# 모든 LLM 호출이 공유하는 OpenAI client
+# 프로세스당 하나의 connection pool을 유지해 요청마다 TLS handshake를 하지 않도록 하고,
+# timeout / retry 정책을 한 곳에서 관리합니다.
+CHAT_MODEL = os.environ.get("OPENAI_CHAT_MODEL", "gpt-4o")
+JSON_OBJECT = {"type": "json_object"}
+OPENAI_TIMEOUT = float(os.environ.get("OPENAI_TIMEOUT", 60))
+OPENAI_MAX_RETRIES = int(os.environ.get("OPENAI_MAX_RETRIES", 2))
+OPENAI_MAX_CONNECTIONS = int(os.environ.get("OPENAI_MAX_CONNECTIONS", 100))
+OPENAI_MAX_KEEPALIVE = int(os.environ.get("OPENAI_MAX_KEEPALIVE", 20))
+
+
+# openai SDK는 import 비용이 커서 (migrate, collectstatic 등 LLM을 쓰지 않는 명령에서도 매번 로드됨)
+# 처음 호출될 때 import하고 client를 생성합니다.
+def _connection_limits():
+    import httpx
+
+    return httpx.Limits(
+        max_connections=OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=OPENAI_MAX_KEEPALIVE,
+        keepalive_expiry=30,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_client():
+    import httpx
+    from openai import OpenAI
+
+    return OpenAI(
+        api_key=os.environ.get("OPENAI_API_KEY"),
+        timeout=OPENAI_TIMEOUT,
+        max_retries=OPENAI_MAX_RETRIES,
+        http_client=httpx.Client(limits=_connection_limits()),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_async_client():
+    import httpx
+    from openai import AsyncOpenAI
+
+    return AsyncOpenAI(
+        api_key=os.environ.get("OPENAI_API_KEY"),
+        timeout=OPENAI_TIMEOUT,
+        max_retries=OPENAI_MAX_RETRIES,
+        http_client=httpx.AsyncClient(limits=_connection_limits()),
+    )
+
+
+# 동시에 들어온 같은 프롬프트(재시도, 중복 클릭 등)는 하나의 OpenAI 호출 결과를 함께 사용
+# LLM_SINGLE_FLIGHT_REDIS_URL을 설정하면 여러 worker 프로세스 사이에서도 합침
+LLM_SINGLE_FLIGHT = os.environ.get("LLM_SINGLE_FLIGHT", "true").lower() == "true"
+LLM_SINGLE_FLIGHT_REDIS_URL = os.environ.get("LLM_SINGLE_FLIGHT_REDIS_URL", "")
+
+
+@lru_cache(maxsize=None)
+def get_single_flight():
+    shared_lock = None
+    if LLM_SINGLE_FLIGHT_REDIS_URL:
+        shared_lock = RedisFlightLock(
+            LLM_SINGLE_FLIGHT_REDIS_URL,
+            # 호출이 재시도까지 모두 끝날 수 있는 시간 동안 lock을 유지
+            lock_timeout=int(OPENAI_TIMEOUT * (OPENAI_MAX_RETRIES + 1)),
+        )
+    return SingleFlight(shared_lock)
+
+
+# 프롬프트 구간(system, 예시, 대화 내역 등)별 토큰 수를 tiktoken으로 세어 기록
+PROMPT_TOKEN_ACCOUNTING = (
+    os.environ.get("PROMPT_TOKEN_ACCOUNTING", "true").lower() == "true"
+)
+
+
+def _record_prompt(prompt, model):
+    if PROMPT_TOKEN_ACCOUNTING and isinstance(prompt, Prompt):
+        record_prompt(prompt.name, model, prompt.section_tokens(model))
+
+
+def _prompt_key(model, temperature, messages, response_format):
+    return flight_key(
+        model,
+        temperature,
+        json.dumps(response_format),
+        json.dumps(messages, ensure_ascii=False),
+    )
+
+
+def _completion_kwargs(response_format):
+    # response_format: JSON_OBJECT 등 (기본값은 일반 텍스트 응답)
+    if response_format is None:
+        return {}
+    return {"response_format": response_format}
+
+
+EMBEDDING_BATCH_SIZE = 2048
+
+
+# EMBEDDING_CACHE_PATH를 빈 값으로 설정하면 디스크 캐시 없이 메모리 LRU만 사용
+# (sqlite 파일은 임베딩을 처음 조회할 때 열어 migrate 등 관리 명령에서는 만들지 않음)
+@lru_cache(maxsize=None)
+def get_embedding_cache():
+    return EmbeddingCache(
+        path=os.environ.get(
+            "EMBEDDING_CACHE_PATH",
+            os.path.join(BASE_DIR, ".cache", "embeddings.sqlite3"),
+        ),
+        max_entries=int(os.environ.get("EMBEDDING_CACHE_MAX_ENTRIES", 10000)),
+    )
+
+
+def get_chat_openai(prompt, model=CHAT_MODEL, temperature=0, response_format=None):
+    # prompt: utils.prompt_builder.Prompt 또는 문자열
+    messages = to_messages(prompt)
+
+    def create():
+        _record_prompt(prompt, model)
+        with span("chat_completion"):
+            response = get_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                **_completion_kwargs(response_format),
+            )
+        record_token_usage(model, response.usage)
+        return response.choices[0].message.content
+
+    if not LLM_SINGLE_FLIGHT:
+        return create()
+    return get_single_flight().do(
+        _prompt_key(model, temperature, messages, response_format), create
+    )
+
+
+# 스트리밍 응답도 마지막 chunk(choices가 비어 있음)로 토큰 사용량을 받도록 요청
+# 설치된 SDK(openai 1.16)에는 stream_options 인자가 없으므로 extra_body로 전달
+STREAM_USAGE_BODY = {"stream_options": {"include_usage": True}}
+
 
+def _record_stream_usage(model, chunk):
+    # SDK의 chunk 모델에 usage 필드가 없으면 dict로 들어옴
+    # (openai.types를 import하면 SDK 전체가 로드되므로 record_token_usage가 읽을 수 있는 객체로 변환)
+    usage = getattr(chunk, "usage", None)
+    if isinstance(usage, dict):
+        usage = SimpleNamespace(**usage)
+    record_token_usage(model, usage)
 
-def get_chat_openai(prompt, model="gpt-4o"):
-    response = client.chat.completions.create(
+
+def stream_chat_openai(prompt, model=CHAT_MODEL):
+    _record_prompt(prompt, model)
+    started = time.perf_counter()
+    stream = get_client().chat.completions.create(
         model=model,
-        messages=[{"role": "user", "content": prompt}],
+        messages=to_messages(prompt),
         temperature=0,
+        stream=True,
+        extra_body=STREAM_USAGE_BODY,
     )
-    output = response.choices[0].message.content
-    return output
+    try:
+        for chunk in stream:
+            if not chunk.choices:
+                _record_stream_usage(model, chunk)
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+    finally:
+        # generator가 중간에 닫히면 (클라이언트 연결 종료 등) upstream 응답도 함께 닫음
+        stream.close()
+        record_span("chat_completion_stream", time.perf_counter() - started)
+
+
+def _split_cached(texts, model):
+    # 입력 순서를 유지한 채 중복을 제거하고, 캐시에 없는 텍스트만 골라냄
+    keys = [embedding_key(text, model) for text in texts]
+    unique = dict(zip(keys, texts))
+    cached = get_embedding_cache().get_many(list(unique))
+    missing = {key: text for key, text in unique.items() if key not in cached}
+    return keys, cached, missing
+
+
+def _batches(missing):
+    # embeddings API는 요청당 최대 2048개의 입력을 받음
+    items = list(missing.items())
+    for start in range(0, len(items), EMBEDDING_BATCH_SIZE):
+        yield dict(items[start : start + EMBEDDING_BATCH_SIZE])
+
+
+def _collect(batch, response):
+    return {
+        key: item.embedding
+        for key, item in zip(batch, sorted(response.data, key=lambda d: d.index))
+    }
+
+
+def get_embeddings(texts, model="text-embedding-3-small"):
+    keys, embeddings, missing = _split_cached(texts, model)
+    # 캐시에 없는 텍스트들만 한 번의 요청으로 임베딩
+    for batch in _batches(missing):
+        with span("embedding"):
+            response = get_client().embeddings.create(
+                input=list(batch.values()), model=model
+            )
+        record_token_usage(model, response.usage)
+        fetched = _collect(batch, response)
+        get_embedding_cache().set_many(fetched)
+        embeddings.update(fetched)
+    return [embeddings[key] for key in keys]
 
 
 def get_embedding(text, model="text-embedding-3-small"):
     # text = text.replace("\n", " ")
-    response = client.embeddings.create(input=[text], model=model).data
-    response = response[0].embedding
-    return response
+    return get_embeddings([text], model=model)[0]
+
+
+# ASGI 모드(async view)에서 사용하는 비동기 버전
+async def aget_chat_openai(
+    prompt, model=CHAT_MODEL, temperature=0, response_format=None
+):
+    messages = to_messages(prompt)
+
+    async def create():
+        _record_prompt(prompt, model)
+        with span("chat_completion"):
+            response = await get_async_client().chat.completions.create(
+                model=model,
+                messages=messages,
+                temperature=temperature,
+                **_completion_kwargs(response_format),
+            )
+        record_token_usage(model, response.usage)
+        return response.choices[0].message.content
+
+    if not LLM_SINGLE_FLIGHT:
+        return await create()
+    return await get_single_flight().ado(
+        _prompt_key(model, temperature, messages, response_format), create
+    )
+
+
+async def astream_chat_openai(prompt, model=CHAT_MODEL):
+    _record_prompt(prompt, model)
+    started = time.perf_counter()
+    stream = await get_async_client().chat.completions.create(
+        model=model,
+        messages=to_messages(prompt),
+        temperature=0,
+        stream=True,
+        extra_body=STREAM_USAGE_BODY,
+    )
+    try:
+        async for chunk in stream:
+            if not chunk.choices:
+                _record_stream_usage(model, chunk)
+                continue
+            content = chunk.choices[0].delta.content
+            if content:
+                yield content
+    finally:
+        await stream.close()
+        record_span("chat_completion_stream", time.perf_counter() - started)
+
+
+async def aget_embeddings(texts, model="text-embedding-3-small"):
+    keys, embeddings, missing = _split_cached(texts, model)
+    for batch in _batches(missing):
+        with span("embedding"):
+            response = await get_async_client().embeddings.create(
+                input=list(batch.values()), model=model
+            )
+        record_token_usage(model, response.usage)
+        fetched = _collect(batch, response)
+        get_embedding_cache().set_many(fetched)
+        embeddings.update(fetched)
+    return [embeddings[key] for key in keys]
+
+
+async def aget_embedding(text, model="text-embedding-3-small"):
+    return (await aget_embeddings([text], model=model))[0]
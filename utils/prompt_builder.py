@@ -0,0 +1,51 @@
+# 프롬프트 조립
+# 모든 요청에서 같은 지시사항 / few-shot 예시는 system message로 맨 앞에 두고,
+# 요청마다 바뀌는 값은 user message에 구간 순서대로 이어 붙입니다.
+# OpenAI는 최근 요청과 같은 prefix가 1024 토큰 이상일 때만 자동으로 캐시합니다.
+# 현재 system prompt는 모두 1024 토큰보다 훨씬 짧고, 자소서 생성 프롬프트는 첫 user 구간(examples)부터
+# 요청마다 달라지므로 가이드라인 / 자소서 생성 요청에는 캐시가 적용되지 않습니다.
+# 캐시가 적용되는 것은 같은 자소서의 채팅처럼 system + 요약 + 대화 내역이 이어지는 요청이며,
+# 실제로 캐시된 토큰 수는 "cached" 토큰 사용량(resumai_llm_tokens_total)으로 확인할 수 있습니다.
+from utils.tokens import count_static_tokens, count_tokens
+
+
+class Prompt:
+    def __init__(self, name, system, sections):
+        self.name = name  # 로그 / metric에서 사용하는 프롬프트 이름
+        self.system = system.strip()
+        self.sections = sections  # [(구간 이름, 값이 채워진 텍스트)]
+
+    @property
+    def user(self):
+        return "\n\n".join(text for _, text in self.sections)
+
+    def messages(self):
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user},
+        ]
+
+    def section_tokens(self, model):
+        tokens = {"system": count_static_tokens(self.system, model)}
+        for name, text in self.sections:
+            tokens[name] = count_tokens(text, model)
+        return tokens
+
+    def __str__(self):
+        # 채팅 기록(ChatHistory.query)에 저장할 때는 하나의 텍스트로 합침
+        return f"{self.system}\n\n{self.user}"
+
+
+def build_prompt(name, system, sections, **values):
+    return Prompt(
+        name,
+        system,
+        [(section, template.format(**values)) for section, template in sections],
+    )
+
+
+def to_messages(prompt):
+    # 구간으로 나뉘지 않은 문자열 프롬프트는 하나의 user message로 보냄
+    if isinstance(prompt, Prompt):
+        return prompt.messages()
+    return [{"role": "user", "content": prompt}]
@@ -0,0 +1,167 @@
+# 동일한 요청 합치기 (single-flight)
+# 같은 key의 호출이 진행 중이면 새 호출은 upstream을 다시 부르지 않고 진행 중인 호출의 결과를 함께 받습니다.
+# 프로세스 내에서는 threading.Event / asyncio.Task로 기다리고,
+# redis_url이 주어지면 Redis lock으로 여러 worker 프로세스 사이에서도 하나의 호출만 실행합니다.
+import asyncio
+import functools
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+
+def flight_key(*parts):
+    return hashlib.sha256("\0".join(str(part) for part in parts).encode()).hexdigest()
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class _AsyncCall:
+    def __init__(self, task):
+        self.task = task
+        self.waiters = 0
+
+
+# 값이 자신의 token과 같을 때만 lock을 지움 (compare-and-delete)
+_RELEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class RedisFlightLock:
+    # 먼저 lock을 잡은 프로세스가 호출하고 결과를 잠시 저장하면, 나머지 프로세스는 그 결과를 읽어감
+    def __init__(self, url, lock_timeout, result_timeout=30, poll_interval=0.1):
+        import redis
+
+        self.client = redis.Redis.from_url(url)
+        self.lock_timeout = lock_timeout
+        self.result_timeout = result_timeout
+        self.poll_interval = poll_interval
+
+    def acquire(self, key):
+        # lock 값으로 소유자 token을 저장하고, lock을 잡지 못하면 None을 반환
+        token = uuid.uuid4().hex
+        if self.client.set(f"flight:lock:{key}", token, nx=True, ex=self.lock_timeout):
+            return token
+        return None
+
+    def release(self, key, token):
+        # 호출이 lock_timeout보다 오래 걸려 lock이 만료된 뒤 다른 프로세스가 잡은 lock은 지우지 않음
+        self.client.eval(_RELEASE_SCRIPT, 1, f"flight:lock:{key}", token)
+
+    def publish(self, key, result):
+        self.client.set(
+            f"flight:result:{key}", json.dumps(result), ex=self.result_timeout
+        )
+
+    def wait(self, key):
+        # 결과가 저장되기 전에 lock이 풀리면 (호출 실패) None을 반환하여 직접 호출하도록 함
+        deadline = time.monotonic() + self.lock_timeout
+        while time.monotonic() < deadline:
+            value = self.client.get(f"flight:result:{key}")
+            if value is not None:
+                return json.loads(value)
+            if not self.client.exists(f"flight:lock:{key}"):
+                return None
+            time.sleep(self.poll_interval)
+        return None
+
+
+class SingleFlight:
+    def __init__(self, shared_lock=None):
+        self.shared_lock = shared_lock
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._async_calls = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _Call()
+
+        if not is_leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = self._call_shared(key, fn)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.event.set()
+
+    def _call_shared(self, key, fn):
+        if self.shared_lock is None:
+            return fn()
+        token = self.shared_lock.acquire(key)
+        if token is None:
+            result = self.shared_lock.wait(key)
+            if result is not None:
+                return result
+            return fn()
+        try:
+            result = fn()
+            self.shared_lock.publish(key, result)
+            return result
+        finally:
+            self.shared_lock.release(key, token)
+
+    async def ado(self, key, fn):
+        # fn은 coroutine을 반환하는 함수 (같은 event loop 안의 중복 호출을 합침)
+        # upstream 호출은 별도 task에서 실행하므로 처음 호출한 요청이 취소되어도(클라이언트 연결 종료 등)
+        # 기다리는 다른 요청은 결과를 받고, 기다리는 요청이 모두 취소된 경우에만 upstream 호출을 취소함
+        call = self._async_calls.get(key)
+        if call is None:
+            call = _AsyncCall(asyncio.create_task(self._acall_shared(key, fn)))
+            self._async_calls[key] = call
+            call.task.add_done_callback(
+                functools.partial(self._finish_async_call, key, call)
+            )
+
+        call.waiters += 1
+        try:
+            return await asyncio.shield(call.task)
+        finally:
+            call.waiters -= 1
+            if not call.waiters and not call.task.done():
+                call.task.cancel()
+
+    def _finish_async_call(self, key, call, task):
+        if self._async_calls.get(key) is call:
+            del self._async_calls[key]
+        # 기다리는 호출이 없을 때 "exception was never retrieved" 경고가 나지 않도록 처리
+        if not task.cancelled():
+            task.exception()
+
+    async def _acall_shared(self, key, fn):
+        if self.shared_lock is None:
+            return await fn()
+        token = await asyncio.to_thread(self.shared_lock.acquire, key)
+        if token is None:
+            result = await asyncio.to_thread(self.shared_lock.wait, key)
+            if result is not None:
+                return result
+            return await fn()
+        try:
+            result = await fn()
+            await asyncio.to_thread(self.shared_lock.publish, key, result)
+            return result
+        finally:
+            await asyncio.to_thread(self.shared_lock.release, key, token)
@@ -0,0 +1,49 @@
+# tiktoken 토큰 수 계산
+# 채팅 메모리 예산과 프롬프트 구간별 토큰 수 기록에서 함께 사용합니다.
+import logging
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def _encoding(model):
+    # tiktoken은 encoding 파일을 읽어오므로 처음 토큰을 셀 때 로드
+    import tiktoken
+
+    try:
+        name = tiktoken.encoding_name_for_model(model)
+    except KeyError:
+        name = "cl100k_base"
+    try:
+        return tiktoken.get_encoding(name)
+    except Exception:
+        # encoding 파일을 내려받을 수 없는 환경(오프라인 등)에서는 글자 수로 근사
+        logger.warning(
+            "tiktoken encoding을 불러오지 못해 글자 수로 토큰 수를 계산합니다."
+        )
+        return None
+
+
+def count_tokens(text, model):
+    encoding = _encoding(model)
+    if encoding is None:
+        return len(text or "")
+    return len(encoding.encode(text or ""))
+
+
+@lru_cache(maxsize=256)
+def count_static_tokens(text, model):
+    # system prompt처럼 매번 같은 텍스트는 한 번만 계산
+    return count_tokens(text, model)
+
+
+def truncate_tokens(text, max_tokens, model):
+    # max_tokens를 넘는 부분을 잘라냄 (토큰 경계에서 자르므로 다시 세어도 max_tokens 이하)
+    encoding = _encoding(model)
+    if encoding is None:
+        return text[:max_tokens]
+    tokens = encoding.encode(text)
+    if len(tokens) <= max_tokens:
+        return text
+    return encoding.decode(tokens[:max_tokens])